@@ -1,18 +1,9 @@
 """
 Agent 定义模块
 """
+from . import definitions
 from .custom_handoff import ConfigurableAgent, ConfigurableHandoffTool
-from .definitions import (
-    CODE_ANALYZER_AGENT_INSTRUCTIONS,
-    COMMAND_AGENT_INSTRUCTIONS,
-    FACT_CHECKER_AGENT_INSTRUCTIONS,
-    FILE_AGENT_INSTRUCTIONS,
-    ORCHESTRATOR_INSTRUCTIONS,
-    SEARCH_AGENT_INSTRUCTIONS,
-    SENDER_AGENT_INSTRUCTIONS,
-    SUMMARIZER_AGENT_INSTRUCTIONS,
-    TASK_PLANNER_AGENT_INSTRUCTIONS,
-)
+from .definitions import get_instructions
 from .orchestrator import (
     create_configurable_handoff_tools,
     create_configurable_sub_agents,
@@ -32,6 +23,7 @@ __all__ = [
     "CODE_ANALYZER_AGENT_INSTRUCTIONS",
     "TASK_PLANNER_AGENT_INSTRUCTIONS",
     "FACT_CHECKER_AGENT_INSTRUCTIONS",
+    "get_instructions",
     "create_orchestrator",
     "create_sub_agents",
     "create_handoff_tools",
@@ -43,3 +35,8 @@ __all__ = [
     "AgentTask",
     "AgentResult",
 ]
+
+
+def __getattr__(name: str):
+    """按需加载 XXX_INSTRUCTIONS 提示词常量，避免导入时读取全部提示词"""
+    return getattr(definitions, name)
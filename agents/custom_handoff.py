@@ -2,14 +2,33 @@
 自定义 HandoffTool - 支持为子 Agent 指定模型提供商
 """
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Generic
 
 from astrbot.core.agent.hooks import BaseAgentRunHooks
 from astrbot.core.agent.run_context import TContext
 from astrbot.core.agent.tool import FunctionTool
 
+# 所有 HandoffTool 共用的默认参数 schema（只读，不要修改）
+DEFAULT_HANDOFF_PARAMETERS = {
+    "type": "object",
+    "properties": {
+        "input": {
+            "type": "string",
+            "description": "The input to be handed off to another agent. This should be a clear and concise request or task.",
+        },
+    },
+}
 
-@dataclass
+
+@lru_cache(maxsize=32)
+def _default_description(agent_name: str | None) -> str:
+    """生成默认的 HandoffTool 描述（按 Agent 名称缓存）"""
+    agent_name = agent_name or "another"
+    return f"Delegate tasks to {agent_name} agent to handle the request."
+
+
+@dataclass(slots=True)
 class ConfigurableAgent(Generic[TContext]):
     """
     可配置的 Agent，支持指定模型提供商
@@ -44,22 +63,13 @@ class ConfigurableHandoffTool(FunctionTool, Generic[TContext]):
         self.agent = agent
         super().__init__(
             name=f"transfer_to_{agent.name}",
-            parameters=parameters or self.default_parameters(),
-            description=agent.instructions or self.default_description(agent.name),
+            parameters=DEFAULT_HANDOFF_PARAMETERS if parameters is None else parameters,
+            description=agent.instructions or _default_description(agent.name),
             **kwargs,
         )
 
     def default_parameters(self) -> dict:
-        return {
-            "type": "object",
-            "properties": {
-                "input": {
-                    "type": "string",
-                    "description": "The input to be handed off to another agent. This should be a clear and concise request or task.",
-                },
-            },
-        }
+        return DEFAULT_HANDOFF_PARAMETERS
 
     def default_description(self, agent_name: str | None) -> str:
-        agent_name = agent_name or "another"
-        return f"Delegate tasks to {agent_name} agent to handle the request."
+        return _default_description(agent_name)
@@ -1,62 +1,100 @@
 """
 Orchestrator Agent 创建和配置
 """
+from __future__ import annotations
+
+from functools import lru_cache
 from typing import TYPE_CHECKING
 
 from astrbot.core.agent.agent import Agent
 from astrbot.core.agent.handoff import HandoffTool
 
 from .custom_handoff import ConfigurableAgent, ConfigurableHandoffTool
-from .definitions import (
-    CODE_ANALYZER_AGENT_INSTRUCTIONS,
-    COMMAND_AGENT_INSTRUCTIONS,
-    FILE_AGENT_INSTRUCTIONS,
-    ORCHESTRATOR_INSTRUCTIONS,
-    SEARCH_AGENT_INSTRUCTIONS,
-    SENDER_AGENT_INSTRUCTIONS,
-    SUMMARIZER_AGENT_INSTRUCTIONS,
-    TASK_PLANNER_AGENT_INSTRUCTIONS,
-)
+from .definitions import get_instructions
 
 if TYPE_CHECKING:
     from ..hooks.orchestrator_hooks import OrchestratorHooks
 
 
+# 内置子 Agent 的工具列表
+FILE_AGENT_TOOLS = ("read_file", "write_file", "edit_file", "list_files", "rename_file", "delete_file")
+COMMAND_AGENT_TOOLS = ("execute_command", "convert_pdf")
+SENDER_AGENT_TOOLS = ("send_file",)
+SUMMARIZER_AGENT_TOOLS = ("read_file", "list_files", "summarize_batch")
+SEARCH_AGENT_TOOLS = ("list_files", "read_file", "search_content")
+
+# 可配置子 Agent 定义：(名称, 工具列表, 开关配置项, 模型提供商配置项, 最大步数)
+CONFIGURABLE_AGENT_SPECS = (
+    # 代码分析代理
+    (
+        "code_analyzer_agent",
+        ("read_file", "list_files", "search_content"),
+        "enable_code_analyzer",
+        "code_analyzer_provider_id",
+        20,
+    ),
+    # 任务规划代理
+    (
+        "task_planner_agent",
+        ("read_file", "list_files", "write_file"),
+        "enable_task_planner",
+        "task_planner_provider_id",
+        15,
+    ),
+)
+
+# create_configurable_sub_agents 实际读取的配置项，用作缓存键
+CONFIGURABLE_AGENT_CONFIG_KEYS = tuple(
+    key for spec in CONFIGURABLE_AGENT_SPECS for key in (spec[2], spec[3])
+)
+
+# Orchestrator 直接使用的工具（非 HandoffTool）
+ORCHESTRATOR_DIRECT_TOOLS = ("get_workspace_info",)
+
+
 def create_sub_agents() -> dict:
     """
     创建所有子 Agent
 
+    子 Agent 只构建一次并缓存，返回的是字典的浅拷贝
+
     Returns:
         Agent 名称到 Agent 对象的映射
     """
+    return dict(_build_sub_agents())
+
+
+@lru_cache(maxsize=1)
+def _build_sub_agents() -> dict:
+    """构建所有子 Agent（结果被缓存）"""
     file_agent = Agent(
         name="file_agent",
-        instructions=FILE_AGENT_INSTRUCTIONS,
-        tools=["read_file", "write_file", "edit_file", "list_files", "rename_file", "delete_file"],
+        instructions=get_instructions("file_agent"),
+        tools=list(FILE_AGENT_TOOLS),
     )
 
     command_agent = Agent(
         name="command_agent",
-        instructions=COMMAND_AGENT_INSTRUCTIONS,
-        tools=["execute_command", "convert_pdf"],
+        instructions=get_instructions("command_agent"),
+        tools=list(COMMAND_AGENT_TOOLS),
     )
 
     sender_agent = Agent(
         name="sender_agent",
-        instructions=SENDER_AGENT_INSTRUCTIONS,
-        tools=["send_file"],
+        instructions=get_instructions("sender_agent"),
+        tools=list(SENDER_AGENT_TOOLS),
     )
 
     summarizer_agent = Agent(
         name="summarizer_agent",
-        instructions=SUMMARIZER_AGENT_INSTRUCTIONS,
-        tools=["read_file", "list_files", "summarize_batch"],
+        instructions=get_instructions("summarizer_agent"),
+        tools=list(SUMMARIZER_AGENT_TOOLS),
     )
 
     search_agent = Agent(
         name="search_agent",
-        instructions=SEARCH_AGENT_INSTRUCTIONS,
-        tools=["list_files", "read_file", "search_content"],
+        instructions=get_instructions("search_agent"),
+        tools=list(SEARCH_AGENT_TOOLS),
     )
 
     return {
@@ -73,13 +111,13 @@ def create_handoff_tools(sub_agents: dict = None) -> list[HandoffTool]:
     为所有子 Agent 创建 HandoffTool
 
     Args:
-        sub_agents: 子 Agent 字典，如果为 None 则自动创建
+        sub_agents: 子 Agent 字典，如果为 None 则使用内置子 Agent 的缓存结果
 
     Returns:
         HandoffTool 列表
     """
     if sub_agents is None:
-        sub_agents = create_sub_agents()
+        return list(_build_builtin_handoff_tools())
 
     handoff_tools = []
     for agent in sub_agents.values():
@@ -88,8 +126,20 @@ def create_handoff_tools(sub_agents: dict = None) -> list[HandoffTool]:
     return handoff_tools
 
 
+@lru_cache(maxsize=1)
+def _build_builtin_handoff_tools() -> tuple[HandoffTool, ...]:
+    """为内置子 Agent 构建 HandoffTool（结果被缓存）"""
+    return tuple(HandoffTool(agent) for agent in _build_sub_agents().values())
+
+
+@lru_cache(maxsize=1)
+def _build_builtin_orchestrator_tools() -> tuple:
+    """内置子 Agent 的 HandoffTools + 直接工具（结果被缓存）"""
+    return _build_builtin_handoff_tools() + ORCHESTRATOR_DIRECT_TOOLS
+
+
 def create_orchestrator(
-    hooks: "OrchestratorHooks" = None,
+    hooks: OrchestratorHooks = None,
     sub_agents: dict = None
 ) -> Agent:
     """
@@ -102,18 +152,15 @@ def create_orchestrator(
     Returns:
         Orchestrator Agent 对象
     """
+    # Orchestrator 的工具列表：HandoffTools + 直接工具（未指定子 Agent 时复用缓存）
     if sub_agents is None:
-        sub_agents = create_sub_agents()
-
-    # 创建 HandoffTools
-    handoff_tools = create_handoff_tools(sub_agents)
-
-    # Orchestrator 的工具列表：HandoffTools + 直接工具
-    tools = handoff_tools + ["get_workspace_info"]
+        tools = list(_build_builtin_orchestrator_tools())
+    else:
+        tools = create_handoff_tools(sub_agents) + list(ORCHESTRATOR_DIRECT_TOOLS)
 
     return Agent(
         name="orchestrator",
-        instructions=ORCHESTRATOR_INSTRUCTIONS,
+        instructions=get_instructions("orchestrator"),
         tools=tools,
         run_hooks=hooks,
     )
@@ -130,31 +177,27 @@ def create_configurable_sub_agents(config: dict = None) -> dict:
         Agent 名称到 ConfigurableAgent 对象的映射
     """
     config = config or {}
-    agents = {}
+    cache_key = tuple(
+        (key, config[key]) for key in CONFIGURABLE_AGENT_CONFIG_KEYS if key in config
+    )
+    return dict(_build_configurable_sub_agents(cache_key))
 
-    # 代码分析代理
-    if config.get("enable_code_analyzer", True):
-        code_analyzer_agent = ConfigurableAgent(
-            name="code_analyzer_agent",
-            instructions=CODE_ANALYZER_AGENT_INSTRUCTIONS,
-            tools=["read_file", "list_files", "search_content"],
-            provider_id=config.get("code_analyzer_provider_id") or None,
-            max_steps=20,
-        )
-        agents["code_analyzer_agent"] = code_analyzer_agent
 
-    # 任务规划代理
-    if config.get("enable_task_planner", True):
-        task_planner_agent = ConfigurableAgent(
-            name="task_planner_agent",
-            instructions=TASK_PLANNER_AGENT_INSTRUCTIONS,
-            tools=["read_file", "list_files", "write_file"],
-            provider_id=config.get("task_planner_provider_id") or None,
-            max_steps=15,
+@lru_cache(maxsize=4)
+def _build_configurable_sub_agents(cache_key: tuple) -> dict:
+    """根据配置项构建可配置子 Agent（结果按配置项缓存）"""
+    config = dict(cache_key)
+    return {
+        name: ConfigurableAgent(
+            name=name,
+            instructions=get_instructions(name),
+            tools=list(tools),
+            provider_id=config.get(provider_key) or None,
+            max_steps=max_steps,
         )
-        agents["task_planner_agent"] = task_planner_agent
-
-    return agents
+        for name, tools, enable_key, provider_key, max_steps in CONFIGURABLE_AGENT_SPECS
+        if config.get(enable_key, True)
+    }
 
 
 def create_configurable_handoff_tools(agents: dict) -> list[ConfigurableHandoffTool]:
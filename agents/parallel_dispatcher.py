@@ -3,20 +3,81 @@
 支持同时派发多个子 Agent 执行任务
 """
 import asyncio
+import hashlib
+import os
+import time
 from dataclasses import dataclass
 from typing import Any
 
 from astrbot.api import logger
-
-
-@dataclass
+from astrbot.core.agent.tool import ToolSet
+from astrbot.core.provider.register import llm_tools as tool_manager
+
+from .definitions import get_instructions
+
+try:
+    from asyncio import timeout as async_timeout
+except ImportError:  # Python < 3.11
+    from async_timeout import timeout as async_timeout
+
+# 结果缓存最多保留的条目数
+RESULT_CACHE_MAX_ENTRIES = 128
+
+# Agent 配置映射（提示词按 Agent 名称从 definitions 加载，
+# provider_attr 为插件实例上保存模型提供商 ID 的属性名，
+# cacheable 表示工具全部只读、结果可以缓存）
+AGENT_CONFIGS: dict[str, dict[str, Any]] = {
+    "code_analyzer_agent": {
+        "tools": ("read_file", "list_files", "search_content"),
+        "provider_attr": "code_analyzer_provider_id",
+        "max_steps": 20,
+        "cacheable": True,
+    },
+    "task_planner_agent": {
+        "tools": ("read_file", "list_files", "write_file"),
+        "provider_attr": "task_planner_provider_id",
+        "max_steps": 15,
+        "cacheable": False,
+    },
+    "file_agent": {
+        "tools": ("read_file", "write_file", "edit_file", "list_files", "rename_file", "delete_file"),
+        "provider_attr": None,
+        "max_steps": 20,
+        "cacheable": False,
+    },
+    "search_agent": {
+        "tools": ("list_files", "read_file", "search_content"),
+        "provider_attr": None,
+        "max_steps": 15,
+        "cacheable": True,
+    },
+    "summarizer_agent": {
+        "tools": ("read_file", "list_files", "summarize_batch"),
+        "provider_attr": None,
+        "max_steps": 15,
+        "cacheable": True,
+    },
+    "fact_checker_agent": {
+        "tools": (
+            "extract_facts", "evaluate_sources", "analyze_results",
+            "generate_report", "verify_news",
+            "read_file", "write_file", "list_files"
+        ),
+        "provider_attr": "fact_checker_provider_id",
+        "max_steps": 25,
+        "cacheable": False,
+    },
+}
+
+
+@dataclass(slots=True, frozen=True)
 class AgentTask:
     """Agent 任务定义"""
     agent_name: str
     task_input: str
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class AgentResult:
     """Agent 执行结果"""
     agent_name: str
@@ -37,6 +98,14 @@ class ParallelDispatcher:
         """
         self.plugin = plugin_instance
         self.max_parallel = 5  # 最大并行数
+        self._semaphore = asyncio.Semaphore(self.max_parallel)
+
+        # 子 Agent 结果缓存（秒），0 表示不缓存
+        self.result_cache_ttl = self.plugin.config.get("agent_result_cache_ttl", 0)
+        self._result_cache: dict[tuple, tuple[float, str]] = {}
+
+        # 工具名元组 -> ToolSet 缓存
+        self._toolset_cache: dict[tuple[str, ...], ToolSet] = {}
 
     async def dispatch(
         self,
@@ -47,6 +116,8 @@ class ParallelDispatcher:
         """
         并行派发多个 Agent 任务
 
+        所有任务都会执行，同时运行的 Agent 数量不超过 max_parallel
+
         Args:
             event: AstrMessageEvent
             tasks: Agent 任务列表
@@ -55,33 +126,14 @@ class ParallelDispatcher:
         Returns:
             AgentResult 列表
         """
-        if len(tasks) > self.max_parallel:
-            tasks = tasks[:self.max_parallel]
-            logger.warning(f"任务数超过限制，截取前 {self.max_parallel} 个")
-
-        # 创建并行任务
+        # 创建并行任务（_execute_agent_task 会把异常转换为失败的 AgentResult）
         coroutines = [
             self._execute_agent_task(event, task, timeout)
             for task in tasks
         ]
 
         # 并行执行
-        results = await asyncio.gather(*coroutines, return_exceptions=True)
-
-        # 处理结果
-        agent_results = []
-        for task, result in zip(tasks, results):
-            if isinstance(result, Exception):
-                agent_results.append(AgentResult(
-                    agent_name=task.agent_name,
-                    success=False,
-                    result="",
-                    error=str(result)
-                ))
-            else:
-                agent_results.append(result)
-
-        return agent_results
+        return list(await asyncio.gather(*coroutines))
 
     async def _execute_agent_task(
         self,
@@ -92,7 +144,8 @@ class ParallelDispatcher:
         """
         执行单个 Agent 任务
 
-        这里使用 context.tool_loop_agent 来运行子 Agent
+        这里使用 context.tool_loop_agent 来运行子 Agent，
+        执行中的异常都会转换为失败的 AgentResult 返回
         """
         try:
             # 获取 Agent 配置
@@ -105,32 +158,44 @@ class ParallelDispatcher:
                     error=f"未找到 Agent: {task.agent_name}"
                 )
 
+            # 只读 Agent 的相同任务且工作区未变化时，在有效期内直接返回缓存结果
+            cache_key = await self._result_cache_key(event, task, agent_config)
+            cached = self._get_cached_result(cache_key)
+            if cached is not None:
+                return AgentResult(
+                    agent_name=task.agent_name,
+                    success=True,
+                    result=cached
+                )
+
             # 获取模型提供商 ID
-            provider_id = agent_config.get("provider_id")
+            provider_attr = agent_config["provider_attr"]
+            provider_id = getattr(self.plugin, provider_attr, None) if provider_attr else None
             if not provider_id:
                 umo = event.unified_msg_origin
                 provider_id = await self.plugin.context.get_current_chat_provider_id(umo=umo)
 
             # 构建工具集
-            tools = self._build_toolset(agent_config.get("tools", []))
+            tools = self._build_toolset(agent_config["tools"])
 
-            # 调用 Agent
-            llm_resp = await asyncio.wait_for(
-                self.plugin.context.tool_loop_agent(
+            # 调用 Agent（限制并发数，在当前任务上设置超时，不额外创建 Task）
+            async with self._semaphore, async_timeout(timeout):
+                llm_resp = await self.plugin.context.tool_loop_agent(
                     event=event,
                     chat_provider_id=provider_id,
                     prompt=task.task_input,
-                    system_prompt=agent_config.get("instructions", ""),
+                    system_prompt=get_instructions(task.agent_name),
                     tools=tools,
-                    max_steps=agent_config.get("max_steps", 15),
-                ),
-                timeout=timeout
-            )
+                    max_steps=agent_config["max_steps"],
+                )
+
+            result_text = llm_resp.completion_text or ""
+            self._store_result(cache_key, result_text)
 
             return AgentResult(
                 agent_name=task.agent_name,
                 success=True,
-                result=llm_resp.completion_text or ""
+                result=result_text
             )
 
         except asyncio.TimeoutError:
@@ -149,67 +214,74 @@ class ParallelDispatcher:
                 error=str(e)
             )
 
+    async def _result_cache_key(
+        self,
+        event,
+        task: AgentTask,
+        agent_config: dict[str, Any]
+    ) -> tuple | None:
+        """生成结果缓存键（包含工作区文件快照），未启用缓存或 Agent 不可缓存时返回 None"""
+        if self.result_cache_ttl <= 0 or not agent_config.get("cacheable", False):
+            return None
+        user_id = event.get_sender_id()
+        workspace = self.plugin.sandbox.get_user_workspace(user_id)
+        fingerprint = await asyncio.to_thread(self._workspace_fingerprint, workspace)
+        digest = hashlib.blake2b(task.task_input.encode("utf-8"), digest_size=16).digest()
+        return (user_id, task.agent_name, digest, fingerprint)
+
+    @staticmethod
+    def _workspace_fingerprint(workspace: str) -> bytes:
+        """根据工作区内所有文件的路径、大小和修改时间生成摘要（在线程中执行）"""
+        entries = []
+        for root, _, files in os.walk(workspace):
+            for name in files:
+                path = os.path.join(root, name)
+                try:
+                    st = os.stat(path, follow_symlinks=False)
+                except OSError:
+                    continue
+                entries.append(f"{os.path.relpath(path, workspace)}\0{st.st_size}\0{st.st_mtime_ns}")
+
+        entries.sort()
+        data = "\n".join(entries).encode("utf-8", errors="surrogateescape")
+        return hashlib.blake2b(data, digest_size=16).digest()
+
+    def _get_cached_result(self, cache_key: tuple | None) -> str | None:
+        """获取未过期的缓存结果"""
+        if cache_key is None:
+            return None
+        entry = self._result_cache.get(cache_key)
+        if entry is None:
+            return None
+        stored_at, result = entry
+        if time.monotonic() - stored_at > self.result_cache_ttl:
+            del self._result_cache[cache_key]
+            return None
+        return result
+
+    def _store_result(self, cache_key: tuple | None, result: str):
+        """缓存执行结果，超出容量时淘汰最早的条目"""
+        if cache_key is None:
+            return
+        self._result_cache.pop(cache_key, None)
+        if len(self._result_cache) >= RESULT_CACHE_MAX_ENTRIES:
+            del self._result_cache[next(iter(self._result_cache))]
+        self._result_cache[cache_key] = (time.monotonic(), result)
+
     def _get_agent_config(self, agent_name: str) -> dict[str, Any] | None:
         """获取 Agent 配置"""
-        from .definitions import (
-            CODE_ANALYZER_AGENT_INSTRUCTIONS,
-            FACT_CHECKER_AGENT_INSTRUCTIONS,
-            FILE_AGENT_INSTRUCTIONS,
-            SEARCH_AGENT_INSTRUCTIONS,
-            SUMMARIZER_AGENT_INSTRUCTIONS,
-            TASK_PLANNER_AGENT_INSTRUCTIONS,
-        )
+        return AGENT_CONFIGS.get(agent_name)
 
-        # Agent 配置映射
-        agent_configs = {
-            "code_analyzer_agent": {
-                "instructions": CODE_ANALYZER_AGENT_INSTRUCTIONS,
-                "tools": ["read_file", "list_files", "search_content"],
-                "provider_id": self.plugin.code_analyzer_provider_id or None,
-                "max_steps": 20,
-            },
-            "task_planner_agent": {
-                "instructions": TASK_PLANNER_AGENT_INSTRUCTIONS,
-                "tools": ["read_file", "list_files", "write_file"],
-                "provider_id": self.plugin.task_planner_provider_id or None,
-                "max_steps": 15,
-            },
-            "file_agent": {
-                "instructions": FILE_AGENT_INSTRUCTIONS,
-                "tools": ["read_file", "write_file", "edit_file", "list_files", "rename_file", "delete_file"],
-                "provider_id": None,
-                "max_steps": 20,
-            },
-            "search_agent": {
-                "instructions": SEARCH_AGENT_INSTRUCTIONS,
-                "tools": ["list_files", "read_file", "search_content"],
-                "provider_id": None,
-                "max_steps": 15,
-            },
-            "summarizer_agent": {
-                "instructions": SUMMARIZER_AGENT_INSTRUCTIONS,
-                "tools": ["read_file", "list_files", "summarize_batch"],
-                "provider_id": None,
-                "max_steps": 15,
-            },
-            "fact_checker_agent": {
-                "instructions": FACT_CHECKER_AGENT_INSTRUCTIONS,
-                "tools": [
-                    "extract_facts", "evaluate_sources", "analyze_results",
-                    "generate_report", "verify_news",
-                    "read_file", "write_file", "list_files"
-                ],
-                "provider_id": getattr(self.plugin, "fact_checker_provider_id", None),
-                "max_steps": 25,
-            },
-        }
-
-        return agent_configs.get(agent_name)
-
-    def _build_toolset(self, tool_names: list[str]):
-        """构建工具集"""
-        from astrbot.core.agent.tool import ToolSet
-        from astrbot.core.provider.register import llm_tools as tool_manager
+    def _build_toolset(self, tool_names: tuple[str, ...]):
+        """
+        构建工具集
+
+        所有工具都已注册时按工具名缓存 ToolSet，有工具缺失时不缓存，
+        以便工具稍后注册后能被重新解析
+        """
+        cached = self._toolset_cache.get(tool_names)
+        if cached is not None:
+            return cached
 
         tools = []
         for name in tool_names:
@@ -217,16 +289,19 @@ class ParallelDispatcher:
             if tool:
                 tools.append(tool)
 
-        return ToolSet(tools=tools) if tools else None
+        if not tools:
+            return None
+
+        toolset = ToolSet(tools=tools)
+        if len(tools) == len(tool_names):
+            self._toolset_cache[tool_names] = toolset
+        return toolset
 
     def format_results(self, results: list[AgentResult]) -> str:
         """格式化并行执行结果"""
-        output_parts = []
-
-        for result in results:
-            if result.success:
-                output_parts.append(f"[{result.agent_name}]\n{result.result}")
-            else:
-                output_parts.append(f"[{result.agent_name}] 失败: {result.error}")
-
-        return "\n\n---\n\n".join(output_parts)
+        return "\n\n---\n\n".join(
+            f"[{result.agent_name}]\n{result.result}"
+            if result.success
+            else f"[{result.agent_name}] 失败: {result.error}"
+            for result in results
+        )
@@ -3,14 +3,27 @@
 检查域名年龄、HTTPS、备案等动态指标
 """
 import asyncio
-import re
+import time
 from dataclasses import dataclass
 
 import aiohttp
 from astrbot.api import logger
 
+from .source_registry import extract_domain
 
-@dataclass
+# 检查结果缓存的默认有效期（秒）
+DEFAULT_CACHE_TTL = 3600
+# 检查结果缓存的最大域名数，超出时淘汰最早写入的条目
+MAX_CACHED_DOMAINS = 1024
+
+# HTTP 连接池设置：每个域名最多保持少量连接，DNS 解析结果缓存 10 分钟
+CONNECTOR_LIMIT = 32
+CONNECTOR_LIMIT_PER_HOST = 4
+DNS_CACHE_TTL = 600
+KEEPALIVE_TIMEOUT = 60
+
+
+@dataclass(slots=True)
 class DynamicCheckResult:
     """动态检查结果"""
     domain: str
@@ -29,10 +42,56 @@ class DynamicChecker:
     def __init__(self, config: dict = None):
         self.config = config or {}
         self.timeout = self.config.get("timeout", 10)
+        self.cache_ttl = self.config.get("cache_ttl", DEFAULT_CACHE_TTL)
+
+        # 复用的 HTTP 会话（保持连接池，避免每次检查都重新握手）
+        self._session: aiohttp.ClientSession | None = None
+
+        # 进行中的检查：域名 -> Task，同一域名的并发检查共用一次结果
+        self._inflight: dict[str, asyncio.Task] = {}
+
+        # 已完成的检查结果：域名 -> (写入时间, 结果)
+        self._cache: dict[str, tuple[float, DynamicCheckResult]] = {}
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """获取复用的 HTTP 会话（首次调用或已关闭时创建）"""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=CONNECTOR_LIMIT,
+                limit_per_host=CONNECTOR_LIMIT_PER_HOST,
+                ttl_dns_cache=DNS_CACHE_TTL,
+                keepalive_timeout=KEEPALIVE_TIMEOUT,
+            )
+            self._session = aiohttp.ClientSession(connector=connector)
+        return self._session
+
+    async def close(self):
+        """关闭 HTTP 会话"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
 
     async def check_all(self, url: str) -> DynamicCheckResult:
-        """执行所有动态检查"""
+        """执行所有动态检查（有效期内直接返回缓存，同一域名正在检查时等待已有的检查结果）"""
         domain = self._extract_domain(url)
+
+        cached = self._cache.get(domain)
+        if cached is not None:
+            if time.monotonic() - cached[0] < self.cache_ttl:
+                return cached[1]
+            del self._cache[domain]
+
+        task = self._inflight.get(domain)
+        if task is None:
+            task = asyncio.ensure_future(self._run_checks(url, domain))
+            self._inflight[domain] = task
+            task.add_done_callback(lambda _: self._inflight.pop(domain, None))
+
+        # shield：某个调用方被取消时不影响其他等待同一检查的调用方
+        return await asyncio.shield(task)
+
+    async def _run_checks(self, url: str, domain: str) -> DynamicCheckResult:
+        """并行执行所有动态检查"""
         result = DynamicCheckResult(domain=domain)
 
         # 并行执行所有检查
@@ -60,10 +119,18 @@ class DynamicChecker:
 
         # 计算评分调整值
         result.score_adjustment = self._calculate_adjustment(result)
+
+        # 只缓存所有检查都得出结论的结果，超时、网络波动等失败下次重新检查
+        if any(isinstance(check, BaseException) for check in checks) or checks[0].get("inconclusive"):
+            return result
+
+        if len(self._cache) >= MAX_CACHED_DOMAINS:
+            del self._cache[next(iter(self._cache))]
+        self._cache[domain] = (time.monotonic(), result)
         return result
 
     async def _check_https(self, url: str) -> dict:
-        """检查 HTTPS 和 SSL 证书"""
+        """检查 HTTPS 和 SSL 证书（请求失败、无法判断时 inconclusive 为 True）"""
         result = {"has_https": False, "ssl_valid": False, "ssl_issuer": ""}
 
         # 确保使用 HTTPS
@@ -75,21 +142,29 @@ class DynamicChecker:
             https_url = f"https://{url}"
 
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    https_url,
-                    timeout=aiohttp.ClientTimeout(total=self.timeout),
-                    ssl=True,
-                    allow_redirects=True
-                ):
-                    result["has_https"] = True
-                    result["ssl_valid"] = True
-                    # 注意：aiohttp 不直接暴露 SSL 证书信息
-                    # 如需获取证书详情，需要使用 ssl 模块
+            session = await self._get_session()
+            request_options = {
+                "timeout": aiohttp.ClientTimeout(total=self.timeout),
+                "ssl": True,
+                "allow_redirects": True,
+            }
+            # 只需确认能建立 HTTPS 连接，用 HEAD 请求避免下载页面内容
+            async with session.head(https_url, **request_options) as resp:
+                status = resp.status
+            # 不支持 HEAD 的站点退回 GET（不读取响应体）
+            if status == 405:
+                async with session.get(https_url, **request_options):
+                    pass
+
+            result["has_https"] = True
+            result["ssl_valid"] = True
+            # 注意：aiohttp 不直接暴露 SSL 证书信息
+            # 如需获取证书详情，需要使用 ssl 模块
         except aiohttp.ClientSSLError:
             result["has_https"] = True
             result["ssl_valid"] = False
         except Exception as e:
+            result["inconclusive"] = True
             logger.debug(f"HTTPS 检查失败: {e}")
 
         return result
@@ -148,9 +223,7 @@ class DynamicChecker:
 
     def _extract_domain(self, url: str) -> str:
         """从URL提取域名"""
-        pattern = r"https?://(?:www\.)?([^/]+)"
-        match = re.search(pattern, url)
-        return match.group(1) if match else url
+        return extract_domain(url)
 
     async def quick_check(self, url: str) -> dict:
         """快速检查（仅检查 HTTPS）"""
@@ -2,13 +2,19 @@
 可信度评估器
 综合静态和动态评估，计算来源可信度评分
 """
+import asyncio
+import re
+from collections import Counter
 from dataclasses import dataclass, field
 
 from .dynamic_checker import DynamicChecker
 from .source_registry import CredibilityLevel, SourceRegistry
 
+# 同时进行的动态检查数量上限
+MAX_CONCURRENT_DYNAMIC_CHECKS = 8
 
-@dataclass
+
+@dataclass(slots=True, frozen=True)
 class CredibilityScore:
     """可信度评分结果"""
     overall_score: float
@@ -27,7 +33,7 @@ class CredibilityScore:
         }
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class EvaluationConfig:
     """评估配置"""
     source_weight: float = 0.4
@@ -40,10 +46,14 @@ class EvaluationConfig:
 class CredibilityEvaluator:
     """可信度评估器"""
 
+    # 按超时和缓存配置在所有评估器实例间共享的 DynamicChecker
+    _shared_checkers: dict[tuple, DynamicChecker] = {}
+
     def __init__(self, config: dict = None):
         self.registry = SourceRegistry()
         self.config = EvaluationConfig(**(config or {}))
-        self.dynamic_checker = DynamicChecker(config)
+        self.dynamic_checker = self._get_shared_checker(config)
+        self._dynamic_semaphore = asyncio.Semaphore(MAX_CONCURRENT_DYNAMIC_CHECKS)
 
         # 情绪化词汇列表（中文）
         self.emotional_words_cn = [
@@ -60,6 +70,18 @@ class CredibilityEvaluator:
             "exclusive", "revealed", "exposed", "truth", "finally",
         ]
 
+        # 预编译情绪化词汇匹配（零宽前瞻不消耗字符，重叠的词也都能匹配到）
+        # 同一位置只取最长的词，词表中不应有互为前缀的词
+        emotional_words = sorted(
+            {w.lower() for w in self.emotional_words_cn + self.emotional_words_en},
+            key=len, reverse=True
+        )
+        self._emotional_re = re.compile(
+            "(?=(" + "|".join(map(re.escape, emotional_words)) + "))"
+        )
+        # 感叹号和问号（半角/全角）
+        self._punct_re = re.compile("[!！?？]")
+
         # 可信度等级对应的基础分数
         self.level_scores = {
             CredibilityLevel.HIGHLY_TRUSTED: 100,
@@ -70,6 +92,17 @@ class CredibilityEvaluator:
             CredibilityLevel.UNKNOWN: 50,
         }
 
+    @classmethod
+    def _get_shared_checker(cls, config: dict | None) -> DynamicChecker:
+        """获取（或创建）与配置匹配的共享 DynamicChecker"""
+        checker = DynamicChecker(config)
+        key = (checker.timeout, checker.cache_ttl)
+        return cls._shared_checkers.setdefault(key, checker)
+
+    async def close(self):
+        """关闭动态检查使用的 HTTP 会话（会话在下次检查时自动重建）"""
+        await self.dynamic_checker.close()
+
     def evaluate_source(self, url: str) -> tuple:
         """
         评估单个来源的可信度
@@ -101,7 +134,8 @@ class CredibilityEvaluator:
         # 动态评估
         dynamic_result = None
         if self.config.enable_dynamic_check:
-            dynamic_result = await self.dynamic_checker.check_all(url)
+            async with self._dynamic_semaphore:
+                dynamic_result = await self.dynamic_checker.check_all(url)
             # 应用动态评分调整
             final_score = min(100, max(0, base_score + dynamic_result.score_adjustment))
         else:
@@ -109,6 +143,22 @@ class CredibilityEvaluator:
 
         return final_score, source_info, dynamic_result
 
+    async def evaluate_sources_batch(self, urls: list[str]) -> list:
+        """
+        并发评估多个来源的可信度（包含动态检查）
+
+        Args:
+            urls: 来源 URL 列表
+
+        Returns:
+            与 urls 顺序一致的 (score, source_info, dynamic_result) 元组列表，
+            某个来源评估失败时对应位置为异常对象
+        """
+        return await asyncio.gather(
+            *(self.evaluate_source_with_dynamic(url) for url in urls),
+            return_exceptions=True
+        )
+
     def evaluate_consistency(self, claims: list[dict]) -> float:
         """
         评估多个来源的一致性
@@ -119,18 +169,15 @@ class CredibilityEvaluator:
         Returns:
             一致性评分 (0-100)
         """
-        if len(claims) < 2:
-            return 50.0
-
-        # 计算支持率
-        supporting = sum(1 for c in claims if c.get("supports", False))
         total = len(claims)
-        support_rate = supporting / total
+        if total < 2:
+            return 50.0
 
-        # 来源数量奖励（更多来源验证更可靠）
-        source_bonus = min(10, (total - 2) * 2)
+        # 支持声明的数量
+        supporting = sum(1 for c in claims if c.get("supports"))
 
-        return min(100, support_rate * 90 + source_bonus)
+        # 支持率 * 90 + 来源数量奖励（更多来源验证更可靠）
+        return min(100, supporting * 90 / total + min(10, (total - 2) * 2))
 
     def evaluate_language(self, text: str) -> float:
         """
@@ -144,17 +191,15 @@ class CredibilityEvaluator:
         """
         text_lower = text.lower()
 
-        # 统计情绪化词汇
-        emotional_count = 0
-        for word in self.emotional_words_cn + self.emotional_words_en:
-            if word.lower() in text_lower:
-                emotional_count += 1
+        # 统计情绪化词汇（每个词只计一次）
+        emotional_count = len(set(self._emotional_re.findall(text_lower)))
 
-        # 统计感叹号
-        exclamation_count = text.count("!") + text.count("！")
+        # 一次扫描统计感叹号和问号
+        punct_counts = Counter(self._punct_re.findall(text))
+        exclamation_count = punct_counts["!"] + punct_counts["！"]
 
-        # 统计问号（过多问号可能是标题党）
-        question_count = text.count("?") + text.count("？")
+        # 过多问号可能是标题党
+        question_count = punct_counts["?"] + punct_counts["？"]
 
         # 计算扣分
         deduction = (
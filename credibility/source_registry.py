@@ -2,13 +2,18 @@
 来源注册表
 管理媒体白名单和黑名单
 """
-import re
 from dataclasses import dataclass, field
-from enum import Enum
+from enum import IntEnum
+from functools import lru_cache
+from types import MappingProxyType
+from urllib.parse import urlsplit
 
+# 每个注册表缓存的域名查询结果条数
+CREDIBILITY_CACHE_SIZE = 1024
 
-class CredibilityLevel(Enum):
-    """可信度等级"""
+
+class CredibilityLevel(IntEnum):
+    """可信度等级（可直接按整数比较高低）"""
     HIGHLY_TRUSTED = 5      # 高度可信（权威官方媒体）
     TRUSTED = 4             # 可信（主流媒体）
     MODERATE = 3            # 中等（一般媒体）
@@ -17,9 +22,14 @@ class CredibilityLevel(Enum):
     UNKNOWN = 0             # 未知来源
 
 
-@dataclass
+# is_trusted / is_untrusted 使用的等级阈值
+_TRUSTED_THRESHOLD = CredibilityLevel.TRUSTED
+_UNTRUSTED_THRESHOLD = CredibilityLevel.UNTRUSTED
+
+
+@dataclass(slots=True, frozen=True)
 class SourceCredibility:
-    """来源可信度信息"""
+    """来源可信度信息（只读，默认名单中的条目在各注册表间共享）"""
     domain: str
     name: str
     level: CredibilityLevel
@@ -28,179 +38,259 @@ class SourceCredibility:
     notes: str = ""
 
 
+def extract_domain(url: str) -> str:
+    """从 URL 提取域名（小写、不含端口和 www. 前缀），无法解析时返回原字符串"""
+    host = _slice_host(url)
+    if host is None:
+        try:
+            host = urlsplit(url if "://" in url else f"http://{url}").hostname
+        except ValueError:
+            host = None
+        if not host:
+            return url
+    return host[4:] if host.startswith("www.") else host
+
+
+def _slice_host(url: str) -> str | None:
+    """
+    直接切出常见 http(s)://host/... 形式的主机名（小写）
+
+    带端口、用户信息或特殊字符等需要完整解析的 URL 返回 None，交给 urlsplit 处理
+    """
+    if url.startswith("https://"):
+        start = 8
+    elif url.startswith("http://"):
+        start = 7
+    else:
+        return None
+
+    end = len(url)
+    for sep in "/?#":
+        index = url.find(sep, start, end)
+        if index >= 0:
+            end = index
+
+    host = url[start:end]
+    if not host or ":" in host or "@" in host or not host.isprintable():
+        return None
+    return host.lower()
+
+
+def _match_domain(
+    whitelist: dict[str, SourceCredibility],
+    blacklist: dict[str, SourceCredibility],
+    domain: str
+) -> SourceCredibility | None:
+    """
+    按域名后缀同时查找白名单和黑名单
+
+    依次尝试完整域名及其各级父域名（如 edition.cnn.com -> cnn.com），
+    返回最具体的匹配项，同一级域名先查白名单；不单独查找顶级域名（如 com）
+    """
+    while True:
+        source = whitelist.get(domain) or blacklist.get(domain)
+        if source is not None:
+            return source
+        dot = domain.find(".")
+        if dot < 0 or domain.find(".", dot + 1) < 0:
+            return None
+        domain = domain[dot + 1:]
+
+
+# 默认白名单：(域名, 名称, 可信度等级, 分类, 国家/地区)
+_TRUSTED_SOURCES = (
+    # 中国官方媒体
+    ("xinhuanet.com", "新华社", CredibilityLevel.HIGHLY_TRUSTED, "official", "CN"),
+    ("people.com.cn", "人民日报", CredibilityLevel.HIGHLY_TRUSTED, "official", "CN"),
+    ("cctv.com", "央视网", CredibilityLevel.HIGHLY_TRUSTED, "official", "CN"),
+    ("gov.cn", "中国政府网", CredibilityLevel.HIGHLY_TRUSTED, "official", "CN"),
+    ("chinanews.com.cn", "中国新闻网", CredibilityLevel.TRUSTED, "official", "CN"),
+    ("gmw.cn", "光明网", CredibilityLevel.TRUSTED, "official", "CN"),
+    ("youth.cn", "中国青年网", CredibilityLevel.TRUSTED, "official", "CN"),
+    ("china.com.cn", "中国网", CredibilityLevel.TRUSTED, "official", "CN"),
+
+    # 国际权威媒体
+    ("reuters.com", "Reuters", CredibilityLevel.HIGHLY_TRUSTED, "mainstream", "UK"),
+    ("apnews.com", "AP News", CredibilityLevel.HIGHLY_TRUSTED, "mainstream", "US"),
+    ("bbc.com", "BBC", CredibilityLevel.TRUSTED, "mainstream", "UK"),
+    ("bbc.co.uk", "BBC", CredibilityLevel.TRUSTED, "mainstream", "UK"),
+    ("cnn.com", "CNN", CredibilityLevel.TRUSTED, "mainstream", "US"),
+    ("nytimes.com", "New York Times", CredibilityLevel.TRUSTED, "mainstream", "US"),
+    ("washingtonpost.com", "Washington Post", CredibilityLevel.TRUSTED, "mainstream", "US"),
+    ("theguardian.com", "The Guardian", CredibilityLevel.TRUSTED, "mainstream", "UK"),
+    ("wsj.com", "Wall Street Journal", CredibilityLevel.TRUSTED, "mainstream", "US"),
+    ("ft.com", "Financial Times", CredibilityLevel.TRUSTED, "mainstream", "UK"),
+    ("economist.com", "The Economist", CredibilityLevel.TRUSTED, "mainstream", "UK"),
+
+    # 事实核查机构
+    ("snopes.com", "Snopes", CredibilityLevel.TRUSTED, "factcheck", "US"),
+    ("factcheck.org", "FactCheck.org", CredibilityLevel.TRUSTED, "factcheck", "US"),
+    ("politifact.com", "PolitiFact", CredibilityLevel.TRUSTED, "factcheck", "US"),
+    ("fullfact.org", "Full Fact", CredibilityLevel.TRUSTED, "factcheck", "UK"),
+
+    # 学术/专业/国际组织
+    ("nature.com", "Nature", CredibilityLevel.HIGHLY_TRUSTED, "academic", "UK"),
+    ("science.org", "Science", CredibilityLevel.HIGHLY_TRUSTED, "academic", "US"),
+    ("who.int", "WHO", CredibilityLevel.HIGHLY_TRUSTED, "official", "INT"),
+    ("un.org", "United Nations", CredibilityLevel.HIGHLY_TRUSTED, "official", "INT"),
+    ("worldbank.org", "World Bank", CredibilityLevel.HIGHLY_TRUSTED, "official", "INT"),
+
+    # 中国主流门户（新闻频道）
+    ("news.sina.com.cn", "新浪新闻", CredibilityLevel.MODERATE, "mainstream", "CN"),
+    ("news.163.com", "网易新闻", CredibilityLevel.MODERATE, "mainstream", "CN"),
+    ("news.qq.com", "腾讯新闻", CredibilityLevel.MODERATE, "mainstream", "CN"),
+    ("news.sohu.com", "搜狐新闻", CredibilityLevel.MODERATE, "mainstream", "CN"),
+    ("thepaper.cn", "澎湃新闻", CredibilityLevel.TRUSTED, "mainstream", "CN"),
+    ("caixin.com", "财新网", CredibilityLevel.TRUSTED, "mainstream", "CN"),
+
+    # ==================== 技术权威来源 ====================
+
+    # 科技巨头官方博客/文档（最高可信度）
+    ("blog.google", "Google官方博客", CredibilityLevel.HIGHLY_TRUSTED, "tech_official", "US"),
+    ("ai.google", "Google AI", CredibilityLevel.HIGHLY_TRUSTED, "tech_official", "US"),
+    ("ai.google.dev", "Google AI开发者", CredibilityLevel.HIGHLY_TRUSTED, "tech_official", "US"),
+    ("deepmind.google", "Google DeepMind", CredibilityLevel.HIGHLY_TRUSTED, "tech_official", "US"),
+    ("developers.google.com", "Google开发者", CredibilityLevel.HIGHLY_TRUSTED, "tech_official", "US"),
+    ("cloud.google.com", "Google Cloud", CredibilityLevel.HIGHLY_TRUSTED, "tech_official", "US"),
+    ("openai.com", "OpenAI官方", CredibilityLevel.HIGHLY_TRUSTED, "tech_official", "US"),
+    ("anthropic.com", "Anthropic官方", CredibilityLevel.HIGHLY_TRUSTED, "tech_official", "US"),
+    ("microsoft.com", "Microsoft官方", CredibilityLevel.HIGHLY_TRUSTED, "tech_official", "US"),
+    ("azure.microsoft.com", "Microsoft Azure", CredibilityLevel.HIGHLY_TRUSTED, "tech_official", "US"),
+    ("devblogs.microsoft.com", "Microsoft开发者博客", CredibilityLevel.HIGHLY_TRUSTED, "tech_official", "US"),
+    ("meta.com", "Meta官方", CredibilityLevel.HIGHLY_TRUSTED, "tech_official", "US"),
+    ("ai.meta.com", "Meta AI", CredibilityLevel.HIGHLY_TRUSTED, "tech_official", "US"),
+    ("engineering.fb.com", "Meta工程博客", CredibilityLevel.HIGHLY_TRUSTED, "tech_official", "US"),
+    ("aws.amazon.com", "AWS官方", CredibilityLevel.HIGHLY_TRUSTED, "tech_official", "US"),
+    ("developer.apple.com", "Apple开发者", CredibilityLevel.HIGHLY_TRUSTED, "tech_official", "US"),
+    ("developer.nvidia.com", "NVIDIA开发者", CredibilityLevel.HIGHLY_TRUSTED, "tech_official", "US"),
+    ("blogs.nvidia.com", "NVIDIA博客", CredibilityLevel.HIGHLY_TRUSTED, "tech_official", "US"),
+
+    # 中国科技公司官方
+    ("qwenlm.github.io", "阿里通义千问", CredibilityLevel.HIGHLY_TRUSTED, "tech_official", "CN"),
+    ("modelscope.cn", "阿里魔搭", CredibilityLevel.HIGHLY_TRUSTED, "tech_official", "CN"),
+    ("cloud.baidu.com", "百度智能云", CredibilityLevel.HIGHLY_TRUSTED, "tech_official", "CN"),
+    ("yiyan.baidu.com", "百度文心一言", CredibilityLevel.HIGHLY_TRUSTED, "tech_official", "CN"),
+    ("open.bigmodel.cn", "智谱AI", CredibilityLevel.HIGHLY_TRUSTED, "tech_official", "CN"),
+    ("platform.deepseek.com", "DeepSeek官方", CredibilityLevel.HIGHLY_TRUSTED, "tech_official", "CN"),
+    ("api-docs.deepseek.com", "DeepSeek文档", CredibilityLevel.HIGHLY_TRUSTED, "tech_official", "CN"),
+    ("hunyuan.tencent.com", "腾讯混元", CredibilityLevel.HIGHLY_TRUSTED, "tech_official", "CN"),
+    ("cloud.tencent.com", "腾讯云", CredibilityLevel.HIGHLY_TRUSTED, "tech_official", "CN"),
+    ("minimax.chat", "MiniMax官方", CredibilityLevel.HIGHLY_TRUSTED, "tech_official", "CN"),
+    ("moonshot.cn", "月之暗面Kimi", CredibilityLevel.HIGHLY_TRUSTED, "tech_official", "CN"),
+    ("01.ai", "零一万物", CredibilityLevel.HIGHLY_TRUSTED, "tech_official", "CN"),
+
+    # 开源社区/代码托管
+    ("github.com", "GitHub", CredibilityLevel.TRUSTED, "tech_platform", "US"),
+    ("huggingface.co", "Hugging Face", CredibilityLevel.TRUSTED, "tech_platform", "US"),
+    ("arxiv.org", "arXiv论文", CredibilityLevel.HIGHLY_TRUSTED, "academic", "US"),
+    ("paperswithcode.com", "Papers With Code", CredibilityLevel.TRUSTED, "academic", "US"),
+
+    # 权威科技媒体
+    ("techcrunch.com", "TechCrunch", CredibilityLevel.TRUSTED, "tech_media", "US"),
+    ("theverge.com", "The Verge", CredibilityLevel.TRUSTED, "tech_media", "US"),
+    ("wired.com", "Wired", CredibilityLevel.TRUSTED, "tech_media", "US"),
+    ("arstechnica.com", "Ars Technica", CredibilityLevel.TRUSTED, "tech_media", "US"),
+    ("venturebeat.com", "VentureBeat", CredibilityLevel.TRUSTED, "tech_media", "US"),
+    ("thenextweb.com", "The Next Web", CredibilityLevel.TRUSTED, "tech_media", "NL"),
+    ("zdnet.com", "ZDNet", CredibilityLevel.TRUSTED, "tech_media", "US"),
+    ("engadget.com", "Engadget", CredibilityLevel.TRUSTED, "tech_media", "US"),
+    ("cnet.com", "CNET", CredibilityLevel.TRUSTED, "tech_media", "US"),
+    ("tomshardware.com", "Tom's Hardware", CredibilityLevel.TRUSTED, "tech_media", "US"),
+    ("anandtech.com", "AnandTech", CredibilityLevel.TRUSTED, "tech_media", "US"),
+
+    # 中国科技媒体
+    ("36kr.com", "36氪", CredibilityLevel.TRUSTED, "tech_media", "CN"),
+    ("infoq.cn", "InfoQ中国", CredibilityLevel.TRUSTED, "tech_media", "CN"),
+    ("jiqizhixin.com", "机器之心", CredibilityLevel.TRUSTED, "tech_media", "CN"),
+    ("leiphone.com", "雷锋网", CredibilityLevel.MODERATE, "tech_media", "CN"),
+    ("ithome.com", "IT之家", CredibilityLevel.MODERATE, "tech_media", "CN"),
+    ("cnbeta.com.tw", "cnBeta", CredibilityLevel.MODERATE, "tech_media", "CN"),
+    ("oschina.net", "开源中国", CredibilityLevel.MODERATE, "tech_media", "CN"),
+    ("csdn.net", "CSDN", CredibilityLevel.LOW, "tech_media", "CN"),
+    ("juejin.cn", "掘金", CredibilityLevel.LOW, "tech_media", "CN"),
+    ("zhihu.com", "知乎", CredibilityLevel.LOW, "social", "CN"),
+    ("segmentfault.com", "SegmentFault", CredibilityLevel.LOW, "tech_media", "CN"),
+
+    # AI/ML 专业资源
+    ("openreview.net", "OpenReview", CredibilityLevel.HIGHLY_TRUSTED, "academic", "US"),
+    ("proceedings.neurips.cc", "NeurIPS", CredibilityLevel.HIGHLY_TRUSTED, "academic", "US"),
+    ("proceedings.mlr.press", "ICML/AISTATS", CredibilityLevel.HIGHLY_TRUSTED, "academic", "US"),
+    ("aclanthology.org", "ACL Anthology", CredibilityLevel.HIGHLY_TRUSTED, "academic", "US"),
+    ("ieeexplore.ieee.org", "IEEE Xplore", CredibilityLevel.HIGHLY_TRUSTED, "academic", "US"),
+    ("dl.acm.org", "ACM Digital Library", CredibilityLevel.HIGHLY_TRUSTED, "academic", "US"),
+
+    # AI 评测/排行榜
+    ("lmarena.ai", "LMArena", CredibilityLevel.TRUSTED, "tech_benchmark", "US"),
+    ("chat.lmsys.org", "LMSYS Chatbot Arena", CredibilityLevel.TRUSTED, "tech_benchmark", "US"),
+    ("scale.com", "Scale AI", CredibilityLevel.TRUSTED, "tech_benchmark", "US"),
+    ("artificialanalysis.ai", "Artificial Analysis", CredibilityLevel.TRUSTED, "tech_benchmark", "US"),
+)
+
+# 默认黑名单（已知假新闻源），格式同上
+_UNTRUSTED_SOURCES = (
+    # 已知的假新闻/低质量来源（示例）
+    # 实际使用时可从配置文件加载
+)
+
+
+def _build_source_table(sources: tuple[tuple, ...]) -> dict[str, SourceCredibility]:
+    """将来源列表构建为 域名 -> SourceCredibility 的映射"""
+    return {
+        domain: SourceCredibility(
+            domain=domain, name=name, level=level,
+            category=category, country=country
+        )
+        for domain, name, level, category, country in sources
+    }
+
+
+# 默认名单只在导入时构建一次，各注册表复制映射（条目对象共享）
+_DEFAULT_WHITELIST = _build_source_table(_TRUSTED_SOURCES)
+_DEFAULT_BLACKLIST = _build_source_table(_UNTRUSTED_SOURCES)
+
+
 @dataclass
 class SourceRegistry:
-    """来源注册表"""
-    whitelist: dict[str, SourceCredibility] = field(default_factory=dict)
-    blacklist: dict[str, SourceCredibility] = field(default_factory=dict)
+    """来源注册表（名单只能通过 add_custom_source / add_to_blacklist 修改）"""
+    _whitelist: dict[str, SourceCredibility] = field(default_factory=dict, init=False)
+    _blacklist: dict[str, SourceCredibility] = field(default_factory=dict, init=False)
     custom_rules: list[dict] = field(default_factory=list)
 
     def __post_init__(self):
         self._init_default_whitelist()
         self._init_default_blacklist()
 
+        # 按域名缓存查询结果，通过 add_custom_source / add_to_blacklist 修改名单时清空
+        self._cached_lookup = lru_cache(maxsize=CREDIBILITY_CACHE_SIZE)(self._lookup_domain)
+
+    @property
+    def whitelist(self) -> MappingProxyType:
+        """白名单（只读视图）"""
+        return MappingProxyType(self._whitelist)
+
+    @property
+    def blacklist(self) -> MappingProxyType:
+        """黑名单（只读视图）"""
+        return MappingProxyType(self._blacklist)
+
     def _init_default_whitelist(self):
         """初始化默认白名单"""
-        trusted_sources = [
-            # 中国官方媒体
-            ("xinhuanet.com", "新华社", CredibilityLevel.HIGHLY_TRUSTED, "official", "CN"),
-            ("people.com.cn", "人民日报", CredibilityLevel.HIGHLY_TRUSTED, "official", "CN"),
-            ("cctv.com", "央视网", CredibilityLevel.HIGHLY_TRUSTED, "official", "CN"),
-            ("gov.cn", "中国政府网", CredibilityLevel.HIGHLY_TRUSTED, "official", "CN"),
-            ("chinanews.com.cn", "中国新闻网", CredibilityLevel.TRUSTED, "official", "CN"),
-            ("gmw.cn", "光明网", CredibilityLevel.TRUSTED, "official", "CN"),
-            ("youth.cn", "中国青年网", CredibilityLevel.TRUSTED, "official", "CN"),
-            ("china.com.cn", "中国网", CredibilityLevel.TRUSTED, "official", "CN"),
-
-            # 国际权威媒体
-            ("reuters.com", "Reuters", CredibilityLevel.HIGHLY_TRUSTED, "mainstream", "UK"),
-            ("apnews.com", "AP News", CredibilityLevel.HIGHLY_TRUSTED, "mainstream", "US"),
-            ("bbc.com", "BBC", CredibilityLevel.TRUSTED, "mainstream", "UK"),
-            ("bbc.co.uk", "BBC", CredibilityLevel.TRUSTED, "mainstream", "UK"),
-            ("cnn.com", "CNN", CredibilityLevel.TRUSTED, "mainstream", "US"),
-            ("nytimes.com", "New York Times", CredibilityLevel.TRUSTED, "mainstream", "US"),
-            ("washingtonpost.com", "Washington Post", CredibilityLevel.TRUSTED, "mainstream", "US"),
-            ("theguardian.com", "The Guardian", CredibilityLevel.TRUSTED, "mainstream", "UK"),
-            ("wsj.com", "Wall Street Journal", CredibilityLevel.TRUSTED, "mainstream", "US"),
-            ("ft.com", "Financial Times", CredibilityLevel.TRUSTED, "mainstream", "UK"),
-            ("economist.com", "The Economist", CredibilityLevel.TRUSTED, "mainstream", "UK"),
-
-            # 事实核查机构
-            ("snopes.com", "Snopes", CredibilityLevel.TRUSTED, "factcheck", "US"),
-            ("factcheck.org", "FactCheck.org", CredibilityLevel.TRUSTED, "factcheck", "US"),
-            ("politifact.com", "PolitiFact", CredibilityLevel.TRUSTED, "factcheck", "US"),
-            ("fullfact.org", "Full Fact", CredibilityLevel.TRUSTED, "factcheck", "UK"),
-
-            # 学术/专业/国际组织
-            ("nature.com", "Nature", CredibilityLevel.HIGHLY_TRUSTED, "academic", "UK"),
-            ("science.org", "Science", CredibilityLevel.HIGHLY_TRUSTED, "academic", "US"),
-            ("who.int", "WHO", CredibilityLevel.HIGHLY_TRUSTED, "official", "INT"),
-            ("un.org", "United Nations", CredibilityLevel.HIGHLY_TRUSTED, "official", "INT"),
-            ("worldbank.org", "World Bank", CredibilityLevel.HIGHLY_TRUSTED, "official", "INT"),
-
-            # 中国主流门户（新闻频道）
-            ("news.sina.com.cn", "新浪新闻", CredibilityLevel.MODERATE, "mainstream", "CN"),
-            ("news.163.com", "网易新闻", CredibilityLevel.MODERATE, "mainstream", "CN"),
-            ("news.qq.com", "腾讯新闻", CredibilityLevel.MODERATE, "mainstream", "CN"),
-            ("news.sohu.com", "搜狐新闻", CredibilityLevel.MODERATE, "mainstream", "CN"),
-            ("thepaper.cn", "澎湃新闻", CredibilityLevel.TRUSTED, "mainstream", "CN"),
-            ("caixin.com", "财新网", CredibilityLevel.TRUSTED, "mainstream", "CN"),
-
-            # ==================== 技术权威来源 ====================
-
-            # 科技巨头官方博客/文档（最高可信度）
-            ("blog.google", "Google官方博客", CredibilityLevel.HIGHLY_TRUSTED, "tech_official", "US"),
-            ("ai.google", "Google AI", CredibilityLevel.HIGHLY_TRUSTED, "tech_official", "US"),
-            ("ai.google.dev", "Google AI开发者", CredibilityLevel.HIGHLY_TRUSTED, "tech_official", "US"),
-            ("deepmind.google", "Google DeepMind", CredibilityLevel.HIGHLY_TRUSTED, "tech_official", "US"),
-            ("developers.google.com", "Google开发者", CredibilityLevel.HIGHLY_TRUSTED, "tech_official", "US"),
-            ("cloud.google.com", "Google Cloud", CredibilityLevel.HIGHLY_TRUSTED, "tech_official", "US"),
-            ("openai.com", "OpenAI官方", CredibilityLevel.HIGHLY_TRUSTED, "tech_official", "US"),
-            ("anthropic.com", "Anthropic官方", CredibilityLevel.HIGHLY_TRUSTED, "tech_official", "US"),
-            ("microsoft.com", "Microsoft官方", CredibilityLevel.HIGHLY_TRUSTED, "tech_official", "US"),
-            ("azure.microsoft.com", "Microsoft Azure", CredibilityLevel.HIGHLY_TRUSTED, "tech_official", "US"),
-            ("devblogs.microsoft.com", "Microsoft开发者博客", CredibilityLevel.HIGHLY_TRUSTED, "tech_official", "US"),
-            ("meta.com", "Meta官方", CredibilityLevel.HIGHLY_TRUSTED, "tech_official", "US"),
-            ("ai.meta.com", "Meta AI", CredibilityLevel.HIGHLY_TRUSTED, "tech_official", "US"),
-            ("engineering.fb.com", "Meta工程博客", CredibilityLevel.HIGHLY_TRUSTED, "tech_official", "US"),
-            ("aws.amazon.com", "AWS官方", CredibilityLevel.HIGHLY_TRUSTED, "tech_official", "US"),
-            ("developer.apple.com", "Apple开发者", CredibilityLevel.HIGHLY_TRUSTED, "tech_official", "US"),
-            ("developer.nvidia.com", "NVIDIA开发者", CredibilityLevel.HIGHLY_TRUSTED, "tech_official", "US"),
-            ("blogs.nvidia.com", "NVIDIA博客", CredibilityLevel.HIGHLY_TRUSTED, "tech_official", "US"),
-
-            # 中国科技公司官方
-            ("qwenlm.github.io", "阿里通义千问", CredibilityLevel.HIGHLY_TRUSTED, "tech_official", "CN"),
-            ("modelscope.cn", "阿里魔搭", CredibilityLevel.HIGHLY_TRUSTED, "tech_official", "CN"),
-            ("cloud.baidu.com", "百度智能云", CredibilityLevel.HIGHLY_TRUSTED, "tech_official", "CN"),
-            ("yiyan.baidu.com", "百度文心一言", CredibilityLevel.HIGHLY_TRUSTED, "tech_official", "CN"),
-            ("open.bigmodel.cn", "智谱AI", CredibilityLevel.HIGHLY_TRUSTED, "tech_official", "CN"),
-            ("platform.deepseek.com", "DeepSeek官方", CredibilityLevel.HIGHLY_TRUSTED, "tech_official", "CN"),
-            ("api-docs.deepseek.com", "DeepSeek文档", CredibilityLevel.HIGHLY_TRUSTED, "tech_official", "CN"),
-            ("hunyuan.tencent.com", "腾讯混元", CredibilityLevel.HIGHLY_TRUSTED, "tech_official", "CN"),
-            ("cloud.tencent.com", "腾讯云", CredibilityLevel.HIGHLY_TRUSTED, "tech_official", "CN"),
-            ("minimax.chat", "MiniMax官方", CredibilityLevel.HIGHLY_TRUSTED, "tech_official", "CN"),
-            ("moonshot.cn", "月之暗面Kimi", CredibilityLevel.HIGHLY_TRUSTED, "tech_official", "CN"),
-            ("01.ai", "零一万物", CredibilityLevel.HIGHLY_TRUSTED, "tech_official", "CN"),
-
-            # 开源社区/代码托管
-            ("github.com", "GitHub", CredibilityLevel.TRUSTED, "tech_platform", "US"),
-            ("huggingface.co", "Hugging Face", CredibilityLevel.TRUSTED, "tech_platform", "US"),
-            ("arxiv.org", "arXiv论文", CredibilityLevel.HIGHLY_TRUSTED, "academic", "US"),
-            ("paperswithcode.com", "Papers With Code", CredibilityLevel.TRUSTED, "academic", "US"),
-
-            # 权威科技媒体
-            ("techcrunch.com", "TechCrunch", CredibilityLevel.TRUSTED, "tech_media", "US"),
-            ("theverge.com", "The Verge", CredibilityLevel.TRUSTED, "tech_media", "US"),
-            ("wired.com", "Wired", CredibilityLevel.TRUSTED, "tech_media", "US"),
-            ("arstechnica.com", "Ars Technica", CredibilityLevel.TRUSTED, "tech_media", "US"),
-            ("venturebeat.com", "VentureBeat", CredibilityLevel.TRUSTED, "tech_media", "US"),
-            ("thenextweb.com", "The Next Web", CredibilityLevel.TRUSTED, "tech_media", "NL"),
-            ("zdnet.com", "ZDNet", CredibilityLevel.TRUSTED, "tech_media", "US"),
-            ("engadget.com", "Engadget", CredibilityLevel.TRUSTED, "tech_media", "US"),
-            ("cnet.com", "CNET", CredibilityLevel.TRUSTED, "tech_media", "US"),
-            ("tomshardware.com", "Tom's Hardware", CredibilityLevel.TRUSTED, "tech_media", "US"),
-            ("anandtech.com", "AnandTech", CredibilityLevel.TRUSTED, "tech_media", "US"),
-
-            # 中国科技媒体
-            ("36kr.com", "36氪", CredibilityLevel.TRUSTED, "tech_media", "CN"),
-            ("infoq.cn", "InfoQ中国", CredibilityLevel.TRUSTED, "tech_media", "CN"),
-            ("jiqizhixin.com", "机器之心", CredibilityLevel.TRUSTED, "tech_media", "CN"),
-            ("leiphone.com", "雷锋网", CredibilityLevel.MODERATE, "tech_media", "CN"),
-            ("ithome.com", "IT之家", CredibilityLevel.MODERATE, "tech_media", "CN"),
-            ("cnbeta.com.tw", "cnBeta", CredibilityLevel.MODERATE, "tech_media", "CN"),
-            ("oschina.net", "开源中国", CredibilityLevel.MODERATE, "tech_media", "CN"),
-            ("csdn.net", "CSDN", CredibilityLevel.LOW, "tech_media", "CN"),
-            ("juejin.cn", "掘金", CredibilityLevel.LOW, "tech_media", "CN"),
-            ("zhihu.com", "知乎", CredibilityLevel.LOW, "social", "CN"),
-            ("segmentfault.com", "SegmentFault", CredibilityLevel.LOW, "tech_media", "CN"),
-
-            # AI/ML 专业资源
-            ("openreview.net", "OpenReview", CredibilityLevel.HIGHLY_TRUSTED, "academic", "US"),
-            ("proceedings.neurips.cc", "NeurIPS", CredibilityLevel.HIGHLY_TRUSTED, "academic", "US"),
-            ("proceedings.mlr.press", "ICML/AISTATS", CredibilityLevel.HIGHLY_TRUSTED, "academic", "US"),
-            ("aclanthology.org", "ACL Anthology", CredibilityLevel.HIGHLY_TRUSTED, "academic", "US"),
-            ("ieeexplore.ieee.org", "IEEE Xplore", CredibilityLevel.HIGHLY_TRUSTED, "academic", "US"),
-            ("dl.acm.org", "ACM Digital Library", CredibilityLevel.HIGHLY_TRUSTED, "academic", "US"),
-
-            # AI 评测/排行榜
-            ("lmarena.ai", "LMArena", CredibilityLevel.TRUSTED, "tech_benchmark", "US"),
-            ("chat.lmsys.org", "LMSYS Chatbot Arena", CredibilityLevel.TRUSTED, "tech_benchmark", "US"),
-            ("scale.com", "Scale AI", CredibilityLevel.TRUSTED, "tech_benchmark", "US"),
-            ("artificialanalysis.ai", "Artificial Analysis", CredibilityLevel.TRUSTED, "tech_benchmark", "US"),
-        ]
-
-        for domain, name, level, category, country in trusted_sources:
-            self.whitelist[domain] = SourceCredibility(
-                domain=domain, name=name, level=level,
-                category=category, country=country
-            )
+        self._whitelist.update(_DEFAULT_WHITELIST)
 
     def _init_default_blacklist(self):
         """初始化默认黑名单（已知假新闻源）"""
-        untrusted_sources = [
-            # 已知的假新闻/低质量来源（示例）
-            # 实际使用时可从配置文件加载
-        ]
-
-        for domain, name, level, category, country in untrusted_sources:
-            self.blacklist[domain] = SourceCredibility(
-                domain=domain, name=name, level=level,
-                category=category, country=country
-            )
+        self._blacklist.update(_DEFAULT_BLACKLIST)
 
     def get_credibility(self, url: str) -> SourceCredibility:
         """获取URL的可信度信息"""
-        domain = self._extract_domain(url)
-
-        # 先检查白名单
-        for key in self.whitelist:
-            if key in domain:
-                return self.whitelist[key]
+        return self._cached_lookup(self._extract_domain(url))
 
-        # 再检查黑名单
-        for key in self.blacklist:
-            if key in domain:
-                return self.blacklist[key]
+    def _lookup_domain(self, domain: str) -> SourceCredibility:
+        """按域名查找来源可信度信息"""
+        # 按域名后缀一次遍历白名单和黑名单
+        source = _match_domain(self._whitelist, self._blacklist, domain)
+        if source is not None:
+            return source
 
         # 未知来源
         return SourceCredibility(
@@ -210,19 +300,21 @@ class SourceRegistry:
 
     def _extract_domain(self, url: str) -> str:
         """从URL提取域名"""
-        pattern = r"https?://(?:www\.)?([^/]+)"
-        match = re.search(pattern, url)
-        return match.group(1) if match else url
+        return extract_domain(url)
 
     def add_custom_source(self, domain: str, name: str, level: CredibilityLevel, category: str):
-        """添加自定义来源到白名单"""
-        self.whitelist[domain] = SourceCredibility(
+        """添加自定义来源到白名单（域名统一转为小写，与查询时一致）"""
+        domain = domain.lower()
+        self._cached_lookup.cache_clear()
+        self._whitelist[domain] = SourceCredibility(
             domain=domain, name=name, level=level, category=category
         )
 
     def add_to_blacklist(self, domain: str, name: str, notes: str = ""):
-        """添加来源到黑名单"""
-        self.blacklist[domain] = SourceCredibility(
+        """添加来源到黑名单（域名统一转为小写，与查询时一致）"""
+        domain = domain.lower()
+        self._cached_lookup.cache_clear()
+        self._blacklist[domain] = SourceCredibility(
             domain=domain, name=name,
             level=CredibilityLevel.UNTRUSTED,
             category="blacklisted",
@@ -232,9 +324,9 @@ class SourceRegistry:
     def is_trusted(self, url: str) -> bool:
         """检查URL是否来自可信来源"""
         credibility = self.get_credibility(url)
-        return credibility.level.value >= CredibilityLevel.TRUSTED.value
+        return credibility.level >= _TRUSTED_THRESHOLD
 
     def is_untrusted(self, url: str) -> bool:
         """检查URL是否来自不可信来源"""
         credibility = self.get_credibility(url)
-        return credibility.level.value <= CredibilityLevel.UNTRUSTED.value
+        return credibility.level <= _UNTRUSTED_THRESHOLD
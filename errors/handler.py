@@ -1,6 +1,7 @@
 """
 错误处理器 - 错误分类、重试机制、用户友好消息
 """
+from collections import OrderedDict
 
 # 用户友好的错误消息（简洁无技术细节）
 ERROR_MESSAGES = {
@@ -18,7 +19,7 @@ ERROR_MESSAGES = {
 }
 
 # 不可恢复错误 - 不重试
-UNRECOVERABLE_ERRORS = [
+UNRECOVERABLE_ERRORS = frozenset({
     "FileNotFoundError",
     "PermissionError",
     "QuotaExceededError",
@@ -27,10 +28,10 @@ UNRECOVERABLE_ERRORS = [
     "FileExistsError",
     "IsADirectoryError",
     "NotADirectoryError",
-]
+})
 
 # 可恢复错误 - 可重试
-RECOVERABLE_ERRORS = [
+RECOVERABLE_ERRORS = frozenset({
     "TimeoutError",
     "asyncio.TimeoutError",
     "ProcessError",
@@ -38,7 +39,7 @@ RECOVERABLE_ERRORS = [
     "OSError",
     "ConnectionError",
     "TemporaryIOError",
-]
+})
 
 # 重试配置
 RETRY_CONFIG = {
@@ -47,12 +48,28 @@ RETRY_CONFIG = {
     "io_retries": 2,            # IO错误最多重试2次
 }
 
+# 最多跟踪的任务重试计数，超出时丢弃最久未更新的任务
+MAX_TRACKED_TASKS = 1024
+
+# 错误重试策略：错误类型 -> (是否可重试, 默认最大重试次数)
+ERROR_POLICY: dict[str, tuple[bool, int]] = {
+    **dict.fromkeys(UNRECOVERABLE_ERRORS, (False, 0)),
+    "TimeoutError": (True, RETRY_CONFIG["timeout_retries"]),
+    "asyncio.TimeoutError": (True, RETRY_CONFIG["timeout_retries"]),
+    "IOError": (True, RETRY_CONFIG["io_retries"]),
+    "OSError": (True, RETRY_CONFIG["io_retries"]),
+}
+
+# 未列出的超时类错误（如 ServerTimeoutError）和其他错误的重试策略
+_TIMEOUT_POLICY = (True, RETRY_CONFIG["timeout_retries"])
+_DEFAULT_POLICY = (True, RETRY_CONFIG["max_retries"])
+
 
 class ErrorHandler:
     """错误处理器"""
 
     def __init__(self):
-        self.retry_counts = {}  # task_id -> retry_count
+        self.retry_counts: OrderedDict[str, int] = OrderedDict()  # task_id -> retry_count
 
     def should_retry(
         self,
@@ -72,27 +89,29 @@ class ErrorHandler:
             (是否重试, 错误消息或None)
         """
         error_type = type(error).__name__
+        policy = ERROR_POLICY.get(error_type)
+        if policy is None:
+            policy = _TIMEOUT_POLICY if "Timeout" in error_type else _DEFAULT_POLICY
+        retryable, default_retries = policy
 
         # 不可恢复错误 - 不重试
-        if error_type in UNRECOVERABLE_ERRORS:
-            return False, self.get_user_message(error)
+        if not retryable:
+            return False, self._message_for_type(error_type)
 
         # 确定最大重试次数
         if max_retries is None:
-            if "Timeout" in error_type:
-                max_retries = RETRY_CONFIG["timeout_retries"]
-            elif error_type in ["IOError", "OSError"]:
-                max_retries = RETRY_CONFIG["io_retries"]
-            else:
-                max_retries = RETRY_CONFIG["max_retries"]
+            max_retries = default_retries
 
         # 检查重试次数
         current_retries = self.retry_counts.get(task_id, 0)
         if current_retries >= max_retries:
-            return False, self.get_user_message(error)
+            return False, self._message_for_type(error_type)
 
         # 可以重试
         self.retry_counts[task_id] = current_retries + 1
+        self.retry_counts.move_to_end(task_id)
+        if len(self.retry_counts) > MAX_TRACKED_TASKS:
+            self.retry_counts.popitem(last=False)
         return True, None
 
     def get_user_message(self, error: Exception) -> str:
@@ -105,12 +124,19 @@ class ErrorHandler:
         Returns:
             简洁的错误消息
         """
-        error_type = type(error).__name__
+        return self._message_for_type(type(error).__name__)
+
+    @staticmethod
+    def _message_for_type(error_type: str) -> str:
+        """按错误类型名获取用户友好的错误消息"""
         return ERROR_MESSAGES.get(error_type, ERROR_MESSAGES["default"])
 
     def reset_retry_count(self, task_id: str):
         """重置任务的重试计数"""
-        self.retry_counts.pop(task_id, None)
+        try:
+            del self.retry_counts[task_id]
+        except KeyError:
+            pass
 
     def clear_all(self):
         """清除所有重试计数"""
@@ -1,6 +1,7 @@
 """
 Orchestrator 钩子 - 信息过滤和错误处理
 """
+from itertools import count
 from typing import TYPE_CHECKING, Any
 
 from astrbot.core.agent.hooks import BaseAgentRunHooks
@@ -16,6 +17,12 @@ from ..utils.text_cleaner import clean_response
 if TYPE_CHECKING:
     from ..main import WorkspacePlugin
 
+# HandoffTool 的工具名前缀（transfer_to_<agent_name>）
+HANDOFF_TOOL_PREFIX = "transfer_to_"
+
+# 任务 ID 计数器（只用于区分进程内的任务，不需要全局唯一）
+_task_counter = count(1)
+
 
 class OrchestratorHooks(BaseAgentRunHooks[AstrAgentContext]):
     """
@@ -45,8 +52,7 @@ class OrchestratorHooks(BaseAgentRunHooks[AstrAgentContext]):
         self.sub_agent_results = []
         self.in_sub_agent = False
         # 生成任务 ID 用于错误重试跟踪
-        import uuid
-        self.current_task_id = str(uuid.uuid4())[:8]
+        self.current_task_id = f"t{next(_task_counter):x}"
 
     async def on_tool_start(
         self,
@@ -56,7 +62,8 @@ class OrchestratorHooks(BaseAgentRunHooks[AstrAgentContext]):
     ):
         """工具调用前调用"""
         # 检测是否进入子 Agent
-        if hasattr(tool, "name") and tool.name.startswith("transfer_to_"):
+        name = getattr(tool, "name", None)
+        if name and name.startswith(HANDOFF_TOOL_PREFIX):
             self.in_sub_agent = True
             # 可以在这里阻止中间消息发送
             # 但 AstrBot 的实现可能不支持直接阻止
@@ -69,11 +76,12 @@ class OrchestratorHooks(BaseAgentRunHooks[AstrAgentContext]):
         tool_result: CallToolResult | None,
     ):
         """工具调用后调用"""
-        if hasattr(tool, "name") and tool.name.startswith("transfer_to_"):
+        name = getattr(tool, "name", None)
+        if name and name.startswith(HANDOFF_TOOL_PREFIX):
             self.in_sub_agent = False
             # 收集子 Agent 结果
             if tool_result:
-                agent_name = tool.name.replace("transfer_to_", "")
+                agent_name = name[len(HANDOFF_TOOL_PREFIX):]
                 self.sub_agent_results.append({
                     "agent": agent_name,
                     "result": tool_result,
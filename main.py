@@ -7,7 +7,9 @@ import fnmatch
 import os
 import re
 import shlex
+import stat
 from datetime import datetime
+from pathlib import Path
 
 import astrbot.api.message_components as Comp
 from astrbot.api import logger
@@ -22,6 +24,7 @@ from .agents.orchestrator import (
     create_handoff_tools,
     create_sub_agents,
 )
+from .agents.parallel_dispatcher import AgentTask, ParallelDispatcher
 from .security import CommandFilter, PathSandbox, PermissionManager
 from .security.sandbox import SecurityError
 from .storage import FileCleaner, QuotaManager
@@ -59,6 +62,14 @@ class WorkspacePlugin(Star):
         self.max_send_file_size = self.config.get("max_send_file_size_mb", 50) * 1024 * 1024
         self.auto_save_uploads = self.config.get("auto_save_uploaded_files", True)
 
+        # LibreOffice 转换使用的用户配置目录池：每个并发转换独占一个配置目录，
+        # 避免争用同一配置目录的锁；配置目录保留复用，省去每次转换时的初始化
+        self._office_profiles: asyncio.Queue[str] = asyncio.Queue()
+        for i in range(max(1, self.config.get("office_pool_size", 2))):
+            self._office_profiles.put_nowait(
+                os.path.join(self.data_dir, ".soffice_profiles", str(i))
+            )
+
         # 多 Agent 模式配置
         self.enable_multi_agent = self.config.get("enable_multi_agent", False)
         self.sub_agents = None
@@ -87,7 +98,6 @@ class WorkspacePlugin(Star):
         self.file_cleaner = FileCleaner(self, self.config)
 
         # 初始化并行调度器
-        from .agents.parallel_dispatcher import ParallelDispatcher
         self.parallel_dispatcher = ParallelDispatcher(self)
 
         logger.info(f"Workspace 插件 v2.0 已加载，数据目录: {self.data_dir}")
@@ -98,9 +108,11 @@ class WorkspacePlugin(Star):
         await self.file_cleaner.start()
 
     async def terminate(self):
-        """插件禁用时调用，清理 HandoffTool 和停止清理任务"""
+        """插件禁用时调用，清理 HandoffTool、停止清理任务并释放网络会话"""
         await self._unregister_handoff_tools()
         await self.file_cleaner.stop()
+        if self.fact_check_tools:
+            await self.fact_check_tools.close()
 
     async def _register_handoff_tools(self):
         """注册 HandoffTool 到 AstrBot 的工具管理器（延迟注册）"""
@@ -113,7 +125,7 @@ class WorkspacePlugin(Star):
 
             # 创建标准子 Agent 和 HandoffTools
             self.sub_agents = create_sub_agents()
-            self.handoff_tools = create_handoff_tools(self.sub_agents)
+            self.handoff_tools = create_handoff_tools()
 
             # 创建可配置的子 Agent（新增代理，支持独立模型配置）
             configurable_agents = create_configurable_sub_agents(self.config)
@@ -221,35 +233,60 @@ class WorkspacePlugin(Star):
         try:
             safe_path = self.sandbox.resolve_path(file_path, workspace)
 
-            if not os.path.exists(safe_path):
-                return f"文件不存在: {file_path}"
-
-            if not os.path.isfile(safe_path):
-                return f"路径不是文件: {file_path}"
-
-            # 检查文件大小
-            file_size = os.path.getsize(safe_path)
-            if file_size > 10 * 1024 * 1024:  # 10MB
-                return f"文件过大 ({self._format_size(file_size)})，请使用 start_line 和 max_lines 参数分段读取"
-
-            with open(safe_path, encoding=encoding, errors="replace") as f:
-                lines = f.readlines()
-
-            total_lines = len(lines)
-            selected_lines = lines[start_line:start_line + max_lines]
-            content = "".join(selected_lines)
-
-            # 添加提示信息
-            if total_lines > start_line + max_lines:
-                content += f"\n\n[文件共 {total_lines} 行，已显示第 {start_line + 1}-{min(start_line + max_lines, total_lines)} 行]"
-
-            return content
+            # 文件检查和读取在同一个线程任务中完成，不阻塞事件循环
+            return await asyncio.to_thread(
+                self._read_file_sync, safe_path, file_path, encoding, start_line, max_lines
+            )
 
         except SecurityError as e:
             return f"安全错误: {str(e)}"
         except Exception as e:
             return f"读取文件失败: {str(e)}"
 
+    def _read_file_sync(
+        self,
+        safe_path: str,
+        file_path: str,
+        encoding: str,
+        start_line: int,
+        max_lines: int
+    ) -> str:
+        """读取文件的指定行范围（在线程中执行）"""
+        # 一次 stat 同时得到存在性、类型和大小
+        try:
+            st = os.stat(safe_path)
+        except OSError:
+            return f"文件不存在: {file_path}"
+
+        if not stat.S_ISREG(st.st_mode):
+            return f"路径不是文件: {file_path}"
+
+        # 检查文件大小
+        file_size = st.st_size
+        if file_size > 10 * 1024 * 1024:  # 10MB
+            return f"文件过大 ({self._format_size(file_size)})，请使用 start_line 和 max_lines 参数分段读取"
+
+        # 逐行读取，只保留需要的行，不把整个文件读入内存
+        start_line = max(start_line, 0)
+        end_line = start_line + max_lines
+        selected_lines = []
+        total_lines = 0
+        with open(safe_path, encoding=encoding, errors="replace") as f:
+            for total_lines, line in enumerate(f, 1):
+                if total_lines > end_line:
+                    # 已读到所需的行，剩余部分只计数（用于提示文件总行数）
+                    total_lines += sum(1 for _ in f)
+                    break
+                if total_lines > start_line:
+                    selected_lines.append(line)
+        content = "".join(selected_lines)
+
+        # 添加提示信息
+        if total_lines > start_line + max_lines:
+            content += f"\n\n[文件共 {total_lines} 行，已显示第 {start_line + 1}-{min(start_line + max_lines, total_lines)} 行]"
+
+        return content
+
     @filter.llm_tool(name="write_file")
     async def write_file(
         self,
@@ -296,28 +333,45 @@ class WorkspacePlugin(Star):
         try:
             safe_path = self.sandbox.resolve_path(file_path, workspace)
 
-            # 配额检查
-            content_size = len(content.encode(encoding))
-            quota_ok, quota_msg = self.quota_manager.check_quota(user_id, workspace, content_size)
-            if not quota_ok:
-                return quota_msg
-
-            # 确保父目录存在
-            parent_dir = os.path.dirname(safe_path)
-            os.makedirs(parent_dir, exist_ok=True)
-
-            # 写入文件
-            write_mode = "w" if mode == "overwrite" else "a"
-            with open(safe_path, write_mode, encoding=encoding) as f:
-                f.write(content)
-
-            return f"文件写入成功: {file_path} ({self._format_size(content_size)})"
+            # 配额检查（需遍历工作区）和写入在同一个线程任务中完成，不阻塞事件循环
+            return await asyncio.to_thread(
+                self._write_file_sync,
+                user_id, workspace, safe_path, file_path, content, encoding, mode
+            )
 
         except SecurityError as e:
             return f"安全错误: {str(e)}"
         except Exception as e:
             return f"写入文件失败: {str(e)}"
 
+    def _write_file_sync(
+        self,
+        user_id: str,
+        workspace: str,
+        safe_path: str,
+        file_path: str,
+        content: str,
+        encoding: str,
+        mode: str
+    ) -> str:
+        """检查配额并写入文件（在线程中执行）"""
+        # 配额检查
+        content_size = len(content.encode(encoding))
+        quota_ok, quota_msg = self.quota_manager.check_quota(user_id, workspace, content_size)
+        if not quota_ok:
+            return quota_msg
+
+        # 确保父目录存在
+        parent_dir = os.path.dirname(safe_path)
+        os.makedirs(parent_dir, exist_ok=True)
+
+        # 写入文件
+        write_mode = "w" if mode == "overwrite" else "a"
+        with open(safe_path, write_mode, encoding=encoding) as f:
+            f.write(content)
+
+        return f"文件写入成功: {file_path} ({self._format_size(content_size)})"
+
     @filter.llm_tool(name="edit_file")
     async def edit_file(
         self,
@@ -362,28 +416,42 @@ class WorkspacePlugin(Star):
         try:
             safe_path = self.sandbox.resolve_path(file_path, workspace)
 
-            if not os.path.exists(safe_path):
-                return f"文件不存在: {file_path}"
+            # 读取、替换和写回在同一个线程任务中完成，不阻塞事件循环
+            return await asyncio.to_thread(
+                self._edit_file_sync, safe_path, file_path, old_content, new_content, encoding
+            )
 
+        except SecurityError as e:
+            return f"安全错误: {str(e)}"
+        except Exception as e:
+            return f"编辑文件失败: {str(e)}"
+
+    @staticmethod
+    def _edit_file_sync(
+        safe_path: str,
+        file_path: str,
+        old_content: str,
+        new_content: str,
+        encoding: str
+    ) -> str:
+        """替换文件中的内容（在线程中执行）"""
+        try:
             with open(safe_path, encoding=encoding, errors="replace") as f:
                 content = f.read()
+        except FileNotFoundError:
+            return f"文件不存在: {file_path}"
 
-            if old_content not in content:
-                return "未找到要替换的内容，请检查 old_content 是否正确"
-
-            # 计算替换次数
-            count = content.count(old_content)
-            new_file_content = content.replace(old_content, new_content)
+        if old_content not in content:
+            return "未找到要替换的内容，请检查 old_content 是否正确"
 
-            with open(safe_path, "w", encoding=encoding) as f:
-                f.write(new_file_content)
+        # 计算替换次数
+        count = content.count(old_content)
+        new_file_content = content.replace(old_content, new_content)
 
-            return f"文件编辑成功: {file_path}，替换了 {count} 处内容"
+        with open(safe_path, "w", encoding=encoding) as f:
+            f.write(new_file_content)
 
-        except SecurityError as e:
-            return f"安全错误: {str(e)}"
-        except Exception as e:
-            return f"编辑文件失败: {str(e)}"
+        return f"文件编辑成功: {file_path}，替换了 {count} 处内容"
 
     @filter.llm_tool(name="list_files")
     async def list_files(
@@ -434,50 +502,103 @@ class WorkspacePlugin(Star):
         try:
             safe_path = self.sandbox.resolve_path(directory, workspace)
 
-            if not os.path.exists(safe_path):
-                return f"目录不存在: {directory}"
+            # 遍历目录在线程中执行，不阻塞事件循环
+            return await asyncio.to_thread(
+                self._list_files_sync, safe_path, workspace, directory, recursive, pattern
+            )
 
-            if not os.path.isdir(safe_path):
-                return f"路径不是目录: {directory}"
+        except SecurityError as e:
+            return f"安全错误: {str(e)}"
+        except Exception as e:
+            return f"列出文件失败: {str(e)}"
 
-            result = []
+    def _list_files_sync(
+        self,
+        safe_path: str,
+        workspace: str,
+        directory: str,
+        recursive: bool,
+        pattern: str
+    ) -> str:
+        """列出目录内容（在线程中执行，用 scandir 复用目录项信息，减少 stat 调用）"""
+        if not os.path.exists(safe_path):
+            return f"目录不存在: {directory}"
 
-            if recursive:
-                for root, dirs, files in os.walk(safe_path):
-                    rel_root = os.path.relpath(root, workspace)
-                    if rel_root == ".":
-                        rel_root = ""
-
-                    for name in sorted(dirs):
-                        path = os.path.join(rel_root, name) if rel_root else name
-                        result.append(f"[目录] {path}/")
-
-                    for name in sorted(files):
-                        if fnmatch.fnmatch(name, pattern):
-                            full_path = os.path.join(root, name)
-                            size = os.path.getsize(full_path)
-                            mtime = datetime.fromtimestamp(os.path.getmtime(full_path))
-                            path = os.path.join(rel_root, name) if rel_root else name
-                            result.append(f"[文件] {path} ({self._format_size(size)}, {mtime:%Y-%m-%d %H:%M})")
-            else:
-                for name in sorted(os.listdir(safe_path)):
-                    full_path = os.path.join(safe_path, name)
-                    if os.path.isdir(full_path):
-                        result.append(f"[目录] {name}/")
-                    elif fnmatch.fnmatch(name, pattern):
-                        size = os.path.getsize(full_path)
-                        mtime = datetime.fromtimestamp(os.path.getmtime(full_path))
-                        result.append(f"[文件] {name} ({self._format_size(size)}, {mtime:%Y-%m-%d %H:%M})")
+        if not os.path.isdir(safe_path):
+            return f"路径不是目录: {directory}"
 
-            if not result:
-                return f"目录为空或没有匹配的文件: {directory}"
+        result = []
+        match = self._compile_name_matcher(pattern)
 
-            return "\n".join(result)
+        if recursive:
+            rel_root = os.path.relpath(safe_path, workspace)
+            self._walk_dir(safe_path, "" if rel_root == "." else rel_root, match, result)
+        else:
+            with os.scandir(safe_path) as it:
+                entries = sorted(it, key=lambda entry: entry.name)
+            for entry in entries:
+                if entry.is_dir():
+                    result.append(f"[目录] {entry.name}/")
+                elif match is None or match(entry.name):
+                    result.append(self._format_file_entry(entry.name, entry.stat()))
 
-        except SecurityError as e:
-            return f"安全错误: {str(e)}"
-        except Exception as e:
-            return f"列出文件失败: {str(e)}"
+        if not result:
+            return f"目录为空或没有匹配的文件: {directory}"
+
+        return "\n".join(result)
+
+    def _walk_dir(self, dir_path: str, rel_root: str, match, result: list[str]):
+        """递归列出目录：先列出子目录和匹配的文件，再依次进入子目录（不跟随符号链接）"""
+        try:
+            with os.scandir(dir_path) as it:
+                entries = sorted(it, key=lambda entry: entry.name)
+        except OSError:
+            # 目录无法访问时跳过，与 os.walk 的默认行为一致
+            return
+
+        dirs = []
+        files = []
+        for entry in entries:
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                is_dir = False
+            (dirs if is_dir else files).append(entry)
+
+        for entry in dirs:
+            path = os.path.join(rel_root, entry.name) if rel_root else entry.name
+            result.append(f"[目录] {path}/")
+
+        for entry in files:
+            if match is None or match(entry.name):
+                path = os.path.join(rel_root, entry.name) if rel_root else entry.name
+                result.append(self._format_file_entry(path, entry.stat()))
+
+        for entry in dirs:
+            if not entry.is_symlink():
+                path = os.path.join(rel_root, entry.name) if rel_root else entry.name
+                self._walk_dir(entry.path, path, match, result)
+
+    @staticmethod
+    def _compile_name_matcher(pattern: str):
+        """
+        将文件名通配符编译为匹配函数（结果与 fnmatch.fnmatch 一致）
+
+        pattern 为 "*" 时返回 None，表示匹配所有文件
+        """
+        if pattern == "*":
+            return None
+
+        match = re.compile(fnmatch.translate(os.path.normcase(pattern))).match
+        if os.path.normcase("A") == "A":
+            return match
+        # 文件名不区分大小写的系统（Windows）上先规范化文件名
+        return lambda name: match(os.path.normcase(name))
+
+    def _format_file_entry(self, path: str, st: os.stat_result) -> str:
+        """格式化文件列表中的一行"""
+        mtime = datetime.fromtimestamp(st.st_mtime)
+        return f"[文件] {path} ({self._format_size(st.st_size)}, {mtime:%Y-%m-%d %H:%M})"
 
     @filter.llm_tool(name="rename_file")
     async def rename_file(
@@ -581,13 +702,16 @@ class WorkspacePlugin(Star):
         try:
             safe_path = self.sandbox.resolve_path(file_path, workspace)
 
-            if not os.path.exists(safe_path):
+            # 一次 stat 同时得到存在性、类型和大小
+            try:
+                st = os.stat(safe_path)
+            except OSError:
                 return f"文件不存在: {file_path}"
 
-            if os.path.isdir(safe_path):
+            if stat.S_ISDIR(st.st_mode):
                 return "不能删除目录，只能删除文件"
 
-            file_size = os.path.getsize(safe_path)
+            file_size = st.st_size
             os.remove(safe_path)
 
             return f"文件删除成功: {file_path} (释放 {self._format_size(file_size)})"
@@ -647,9 +771,7 @@ class WorkspacePlugin(Star):
                 return f"不支持的输出格式: {output_format}，支持 txt/md/html"
 
             output_name = f"{base_name}.{output_ext}"
-            output_dir = os.path.join(workspace, "outputs")
-            os.makedirs(output_dir, exist_ok=True)
-            output_path = os.path.join(output_dir, output_name)
+            output_path = os.path.join(workspace, "outputs", output_name)
 
             # 使用 pdftotext 提取文本
             process = await asyncio.create_subprocess_exec(
@@ -687,8 +809,7 @@ class WorkspacePlugin(Star):
 </html>"""
 
             # 写入输出文件
-            with open(output_path, "w", encoding="utf-8") as f:
-                f.write(final_content)
+            await asyncio.to_thread(self._write_output_sync, output_path, final_content)
 
             return f"PDF 转换成功，文件已保存到: outputs/{output_name}。请立即使用 send_file 工具将此文件发送给用户，不要读取文件内容。"
 
@@ -697,6 +818,13 @@ class WorkspacePlugin(Star):
         except Exception as e:
             return f"PDF 转换失败 无法完成: {str(e)[:100]}"
 
+    @staticmethod
+    def _write_output_sync(output_path: str, content: str) -> None:
+        """写入转换结果，必要时创建输出目录（在线程中执行）"""
+        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+        with open(output_path, "w", encoding="utf-8") as f:
+            f.write(content)
+
     @filter.llm_tool(name="convert_office")
     async def convert_office(
         self,
@@ -749,22 +877,32 @@ class WorkspacePlugin(Star):
             output_dir = os.path.join(workspace, "outputs")
             os.makedirs(output_dir, exist_ok=True)
 
-            # 使用 LibreOffice 转换
-            process = await asyncio.create_subprocess_exec(
-                "soffice",
-                "--headless",
-                "--convert-to", output_format,
-                "--outdir", output_dir,
-                safe_input,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-                cwd=workspace
-            )
+            # 使用 LibreOffice 转换（从配置目录池借用一个配置目录，池空时等待）
+            profile_dir = await self._office_profiles.get()
+            process = None
+            try:
+                process = await asyncio.create_subprocess_exec(
+                    "soffice",
+                    f"-env:UserInstallation={Path(profile_dir).as_uri()}",
+                    "--headless",
+                    "--convert-to", output_format,
+                    "--outdir", output_dir,
+                    safe_input,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE,
+                    cwd=workspace
+                )
 
-            stdout, stderr = await asyncio.wait_for(
-                process.communicate(),
-                timeout=180
-            )
+                stdout, stderr = await asyncio.wait_for(
+                    process.communicate(),
+                    timeout=180
+                )
+            finally:
+                # 超时等情况下结束残留进程，释放配置目录后再归还
+                if process is not None and process.returncode is None:
+                    process.kill()
+                    await process.wait()
+                self._office_profiles.put_nowait(profile_dir)
 
             if process.returncode != 0:
                 error = stderr.decode("utf-8", errors="replace")
@@ -1413,7 +1551,7 @@ class WorkspacePlugin(Star):
         - 任何可以并行执行的多任务场景
 
         注意事项：
-        - 最多同时执行 5 个 Agent
+        - 最多同时执行 5 个 Agent，超出的任务排队执行
         - 每个 Agent 有 120 秒超时限制
         - 各 Agent 独立执行，互不影响
         - 结果会汇总后返回
@@ -1443,8 +1581,6 @@ class WorkspacePlugin(Star):
         if not allowed:
             return f"权限不足: {msg}"
 
-        from .agents.parallel_dispatcher import AgentTask
-
         # 解析任务
         agent_tasks = []
         for task in tasks:
@@ -1659,20 +1795,20 @@ class WorkspacePlugin(Star):
             plan = self.fact_check_tools.get_verification_plan(news_text)
 
             lines = [
-                f"验证计划 - 共 {plan['total_facts']} 个事实点",
+                f"验证计划 - 共 {plan.total_facts} 个事实点",
                 "",
-                f"高优先级: {len(plan['high_priority'])} 个",
-                f"中优先级: {len(plan['medium_priority'])} 个",
-                f"低优先级: {len(plan['low_priority'])} 个",
+                f"高优先级: {len(plan.high_priority)} 个",
+                f"中优先级: {len(plan.medium_priority)} 个",
+                f"低优先级: {len(plan.low_priority)} 个",
                 "",
                 "建议搜索查询:",
             ]
 
-            for i, query in enumerate(plan["search_queries"][:5], 1):
+            for i, query in enumerate(plan.search_queries[:5], 1):
                 lines.append(f"  {i}. {query}")
 
-            if len(plan["search_queries"]) > 5:
-                lines.append(f"  ... 还有 {len(plan['search_queries']) - 5} 个查询")
+            if len(plan.search_queries) > 5:
+                lines.append(f"  ... 还有 {len(plan.search_queries) - 5} 个查询")
 
             return "\n".join(lines)
 
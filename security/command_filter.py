@@ -3,6 +3,44 @@
 """
 import re
 import shlex
+from functools import lru_cache
+
+# 命令校验结果缓存的最大条目数
+COMMAND_CACHE_SIZE = 1024
+
+# 与 shlex 相同的空白字符分词（仅用于不含引号和转义的命令）
+_TOKEN_RE = re.compile(r"[^ \t\r\n]+")
+
+# 需要交给 shlex 处理的字符
+_SHLEX_CHARS = frozenset("\"'\\")
+
+
+def _split_command(command: str) -> list[str]:
+    """
+    拆分命令参数
+
+    不含引号和反斜杠的命令直接用正则分词（结果与 shlex.split 一致），
+    其余情况交给 shlex.split 处理
+
+    Raises:
+        ValueError: 命令引号不匹配等解析错误
+    """
+    if _SHLEX_CHARS.isdisjoint(command):
+        return _TOKEN_RE.findall(command)
+    return shlex.split(command)
+
+
+def _compile_alternation(patterns, exclude: tuple = ()) -> re.Pattern:
+    """将多个正则合并为一个预编译的分支正则（跳过 exclude 中的模式）"""
+    return re.compile("|".join(f"(?:{p})" for p in patterns if p not in exclude))
+
+
+def _split_blocked_args(blocked_args) -> tuple[frozenset[str], tuple[str, ...]]:
+    """将禁止参数拆分为需完全匹配的参数名和需检查是否包含的协议前缀（如 ephemeral:）"""
+    return (
+        frozenset(b for b in blocked_args if ":" not in b),
+        tuple(b for b in blocked_args if ":" in b),
+    )
 
 
 class CommandFilter:
@@ -125,7 +163,7 @@ class CommandFilter:
     }
 
     # 绝对禁止的命令黑名单
-    COMMAND_BLACKLIST: list[str] = [
+    COMMAND_BLACKLIST: frozenset[str] = frozenset({
         # 系统危险命令
         "sudo", "su", "chmod", "chown", "chgrp", "chroot",
         "rm", "rmdir", "mkfs", "dd", "fdisk", "mount", "umount",
@@ -157,11 +195,14 @@ class CommandFilter:
         "make", "cmake", "gcc", "g++", "clang",  # 编译器
         "ln", "link", "mklink",  # 符号链接
         "cp", "mv",  # 可能用于覆盖重要文件
-    ]
+    })
+
+    # 管道符模式（但排除引号内的）
+    PIPE_PATTERN = r'(?<!")\|(?!")'
 
     # 危险字符模式（注意：ffmpeg 的 filter_complex 中使用 | 作为分隔符，需要特殊处理）
     DANGEROUS_PATTERNS: list[str] = [
-        r'(?<!")\|(?!")',  # 管道（但排除引号内的）- 简化为不检测，由其他机制保护
+        PIPE_PATTERN,      # 管道
         r";",              # 命令分隔
         r"&&",             # 逻辑与
         r"\|\|",           # 逻辑或
@@ -176,7 +217,21 @@ class CommandFilter:
     ]
 
     # 允许包含管道符的命令（如 ffmpeg 的 filter_complex）
-    PIPE_ALLOWED_COMMANDS: list[str] = ["ffmpeg", "ffprobe"]
+    PIPE_ALLOWED_COMMANDS: frozenset[str] = frozenset({"ffmpeg", "ffprobe"})
+
+    # 预编译的危险模式：普通命令检测全部模式，允许管道的命令跳过管道符检测
+    _DANGEROUS_RE = _compile_alternation(DANGEROUS_PATTERNS)
+    _DANGEROUS_RE_PIPE_ALLOWED = _compile_alternation(DANGEROUS_PATTERNS, exclude=(PIPE_PATTERN,))
+
+    # 危险模式至少包含其中一个字符，不含这些字符的命令无需正则检测
+    _DANGER_CHARS = frozenset(";&|$`<>~")
+
+    # 预处理的参数限制：命令 -> (完全匹配的参数集合, 协议前缀元组)，没有限制的命令不在其中
+    _BLOCKED_ARGS: dict[str, tuple[frozenset[str], tuple[str, ...]]] = {
+        cmd: _split_blocked_args(cfg["blocked_args"])
+        for cmd, cfg in COMMAND_WHITELIST.items()
+        if cfg.get("blocked_args")
+    }
 
     def __init__(self, config: dict):
         """
@@ -194,6 +249,16 @@ class CommandFilter:
             c.strip() for c in extra_cmds.split(",") if c.strip()
         )
 
+        # 允许的命令列表及其展示文本（配置不变，只计算一次）
+        self._allowed_commands: tuple[str, ...] = tuple(
+            sorted(self.COMMAND_WHITELIST.keys() | self.extra_whitelist)
+        )
+        self._allowed_commands_str = ", ".join(self._allowed_commands)
+
+        # 校验结果和超时时间只取决于命令字符串和上面的配置，按命令缓存
+        self._cached_check = lru_cache(maxsize=COMMAND_CACHE_SIZE)(self._check_command)
+        self._cached_timeout = lru_cache(maxsize=COMMAND_CACHE_SIZE)(self._lookup_timeout)
+
     def validate_command(self, command: str, user_workspace: str) -> tuple[bool, str]:
         """
         验证命令是否安全
@@ -205,30 +270,33 @@ class CommandFilter:
         Returns:
             (是否安全, 错误信息或 "OK")
         """
-        command = command.strip()
+        return self._cached_check(command.strip())
 
+    def _check_command(self, command: str) -> tuple[bool, str]:
+        """验证命令是否安全（command 已去除首尾空白，结果被缓存）"""
         if not command:
             return False, "命令不能为空"
 
-        # 0. 先获取基础命令名（用于判断是否跳过某些检测）
+        # 0. 解析命令并获取基础命令名（用于判断是否跳过某些检测）
         try:
-            first_part = shlex.split(command)[0] if command else ""
-        except ValueError:
-            first_part = command.split()[0] if command.split() else ""
-
-        # 1. 检查危险模式（对某些命令跳过管道符检测）
-        for pattern in self.DANGEROUS_PATTERNS:
-            # 对 ffmpeg 等命令跳过管道符检测（filter_complex 需要用 | 分隔）
-            if pattern in [r'(?<!")\|(?!")', r"\|"] and first_part in self.PIPE_ALLOWED_COMMANDS:
-                continue
-            if re.search(pattern, command):
+            cmd_parts = _split_command(command)
+            parse_error = None
+        except ValueError as e:
+            cmd_parts, parse_error = [], e
+        first_part = cmd_parts[0] if cmd_parts else command.split()[0]
+
+        # 1. 检查危险模式（对 ffmpeg 等命令跳过管道符检测，filter_complex 需要用 | 分隔）
+        if not self._DANGER_CHARS.isdisjoint(command):
+            if first_part in self.PIPE_ALLOWED_COMMANDS:
+                dangerous_re = self._DANGEROUS_RE_PIPE_ALLOWED
+            else:
+                dangerous_re = self._DANGEROUS_RE
+            if dangerous_re.search(command):
                 return False, "检测到危险模式，命令被拒绝"
 
-        # 2. 解析命令
-        try:
-            cmd_parts = shlex.split(command)
-        except ValueError as e:
-            return False, f"命令解析失败: {str(e)}"
+        # 2. 检查命令解析结果
+        if parse_error is not None:
+            return False, f"命令解析失败: {str(parse_error)}"
 
         if not cmd_parts:
             return False, "命令不能为空"
@@ -241,28 +309,29 @@ class CommandFilter:
 
         # 4. 检查白名单
         if base_cmd not in self.COMMAND_WHITELIST and base_cmd not in self.extra_whitelist:
-            return False, f"命令 '{base_cmd}' 不在允许列表中。允许的命令: {', '.join(self.COMMAND_WHITELIST.keys())}"
+            return False, f"命令 '{base_cmd}' 不在允许列表中。允许的命令: {self._allowed_commands_str}"
 
-        # 5. 检查命令特定的参数限制
-        if base_cmd in self.COMMAND_WHITELIST:
-            whitelist_config = self.COMMAND_WHITELIST[base_cmd]
-            blocked_args = whitelist_config.get("blocked_args", [])
+        # 5. 检查命令特定的参数限制（没有限制的命令直接跳过）
+        blocked_args = self._BLOCKED_ARGS.get(base_cmd)
+        if blocked_args:
+            blocked_exact, blocked_prefixes = blocked_args
 
             for arg in cmd_parts[1:]:
                 # 分离参数名和值（处理 --arg=value 格式）
-                if "=" in arg:
-                    param_name = arg.split("=")[0]
-                else:
-                    param_name = arg
+                param_name = arg.split("=", 1)[0]
 
                 # 精确匹配检查，避免误匹配
-                for blocked in blocked_args:
-                    # 完全匹配或以 blocked= 开头
-                    if param_name == blocked or param_name.startswith(blocked + "="):
-                        return False, f"参数 '{param_name}' 被禁止使用"
-                    # 对于特殊协议前缀（如 ephemeral:, msl:）检查是否包含
-                    if ":" in blocked and blocked in arg:
-                        return False, f"参数 '{arg}' 包含被禁止的内容"
+                if param_name in blocked_exact:
+                    return False, f"参数 '{param_name}' 被禁止使用"
+                # 带值的禁止参数（如 -dSAFER=false）需要完整匹配
+                if arg in blocked_exact:
+                    return False, f"参数 '{arg}' 被禁止使用"
+
+                # 对于特殊协议前缀（如 ephemeral:, msl:）检查是否包含
+                if ":" in arg:
+                    for blocked in blocked_prefixes:
+                        if blocked in arg:
+                            return False, f"参数 '{arg}' 包含被禁止的内容"
 
         return True, "OK"
 
@@ -276,8 +345,12 @@ class CommandFilter:
         Returns:
             超时时间（秒）
         """
+        return self._cached_timeout(command)
+
+    def _lookup_timeout(self, command: str) -> int:
+        """获取命令的超时时间（结果被缓存）"""
         try:
-            cmd_parts = shlex.split(command)
+            cmd_parts = _split_command(command)
             base_cmd = cmd_parts[0] if cmd_parts else ""
 
             if base_cmd in self.COMMAND_WHITELIST:
@@ -290,9 +363,7 @@ class CommandFilter:
 
     def get_allowed_commands(self) -> list[str]:
         """获取所有允许的命令列表"""
-        commands = list(self.COMMAND_WHITELIST.keys())
-        commands.extend(self.extra_whitelist)
-        return sorted(set(commands))
+        return list(self._allowed_commands)
 
     def get_command_description(self, cmd: str) -> str:
         """获取命令的描述"""
@@ -5,7 +5,7 @@ import asyncio
 import logging
 import os
 import shutil
-from datetime import datetime, timedelta
+import time
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
@@ -13,6 +13,16 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+# 同时清理的用户工作区数量上限
+MAX_CONCURRENT_CLEANS = 8
+
+# 平台支持时（Linux 等）基于目录 fd 按名称删除文件（unlinkat），省去每个文件的完整路径解析
+_USE_DIR_FD = (
+    {os.open, os.unlink, os.rmdir} <= os.supports_dir_fd
+    and os.scandir in os.supports_fd
+)
+_DIR_OPEN_FLAGS = os.O_RDONLY | getattr(os, "O_DIRECTORY", 0) | getattr(os, "O_NOFOLLOW", 0)
+
 
 class FileCleaner:
     """定时文件清理器"""
@@ -88,16 +98,31 @@ class FileCleaner:
         if not os.path.exists(workspaces_dir):
             return
 
+        # 列出所有用户工作区
+        with os.scandir(workspaces_dir) as it:
+            user_workspaces = [(entry.path, entry.name) for entry in it if entry.is_dir()]
+
+        # 并发清理各用户工作区（限制同时进行的数量）
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_CLEANS)
+
+        async def clean_one(user_workspace: str, user_id: str) -> tuple:
+            async with semaphore:
+                return await self._clean_workspace(user_workspace, user_id)
+
+        results = await asyncio.gather(
+            *(clean_one(path, user_id) for path, user_id in user_workspaces),
+            return_exceptions=True
+        )
+
+        # 单个工作区失败不影响其他工作区的统计
         total_cleaned = 0
         total_size = 0
-
-        # 遍历所有用户工作区
-        for user_id in os.listdir(workspaces_dir):
-            user_workspace = os.path.join(workspaces_dir, user_id)
-            if os.path.isdir(user_workspace):
-                cleaned, size = await self._clean_workspace(user_workspace, user_id)
-                total_cleaned += cleaned
-                total_size += size
+        for (_, user_id), result in zip(user_workspaces, results):
+            if isinstance(result, BaseException):
+                logger.error(f"清理用户 {user_id} 的工作区失败: {result}")
+                continue
+            total_cleaned += result[0]
+            total_size += result[1]
 
         if total_cleaned > 0:
             size_str = self._format_size(total_size)
@@ -105,7 +130,20 @@ class FileCleaner:
 
     async def _clean_workspace(self, workspace: str, user_id: str) -> tuple:
         """
-        清理单个用户工作区
+        清理单个用户工作区（文件系统操作在线程中执行，不阻塞事件循环）
+
+        Args:
+            workspace: 工作区路径
+            user_id: 用户ID
+
+        Returns:
+            (删除文件数, 释放空间大小)
+        """
+        return await asyncio.to_thread(self._clean_workspace_sync, workspace, user_id)
+
+    def _clean_workspace_sync(self, workspace: str, user_id: str) -> tuple:
+        """
+        清理单个用户工作区（同步实现）
 
         Args:
             workspace: 工作区路径
@@ -116,7 +154,7 @@ class FileCleaner:
         """
         cleaned_count = 0
         cleaned_size = 0
-        cutoff_time = datetime.now() - timedelta(days=self.file_max_age_days)
+        cutoff_ts = time.time() - self.file_max_age_days * 86400
 
         # 确定要清理的目录
         if self.clean_temp_only:
@@ -126,37 +164,86 @@ class FileCleaner:
 
         for dir_name in dirs_to_clean:
             dir_path = os.path.join(workspace, dir_name)
-            if not os.path.exists(dir_path):
+            if not os.path.isdir(dir_path):
                 continue
 
-            # 遍历目录中的文件
-            for root, dirs, files in os.walk(dir_path, topdown=False):
-                for filename in files:
-                    file_path = os.path.join(root, filename)
-                    try:
-                        # 检查文件修改时间
-                        mtime = datetime.fromtimestamp(os.path.getmtime(file_path))
-                        if mtime < cutoff_time:
-                            file_size = os.path.getsize(file_path)
-                            os.remove(file_path)
-                            cleaned_count += 1
-                            cleaned_size += file_size
-                            logger.debug(f"删除过期文件: {file_path}")
-                    except OSError as e:
-                        logger.debug(f"删除文件失败 {file_path}: {e}")
+            count, size = self._clean_dir(dir_path, cutoff_ts)
+            cleaned_count += count
+            cleaned_size += size
+
+        if cleaned_count > 0:
+            logger.info(f"用户 {user_id}: 清理 {cleaned_count} 个文件，释放 {self._format_size(cleaned_size)}")
+
+        return cleaned_count, cleaned_size
 
-                # 删除空目录
-                for dirname in dirs:
-                    dir_full_path = os.path.join(root, dirname)
+    def _clean_dir(self, path: str, cutoff_ts: float, dir_fd: int | None = None) -> tuple:
+        """
+        递归删除目录中的过期文件，并删除清理后为空的子目录
+
+        Args:
+            path: 目录路径
+            cutoff_ts: 过期时间戳，修改时间早于它的文件会被删除
+            dir_fd: 已打开的 path 目录 fd，有 fd 时按文件名删除
+
+        Returns:
+            (删除文件数, 释放空间大小)
+        """
+        if dir_fd is None and _USE_DIR_FD:
+            try:
+                dir_fd = os.open(path, _DIR_OPEN_FLAGS)
+            except OSError as e:
+                # 符号链接或无权限的目录直接跳过
+                logger.warning(f"无法打开目录 {path}: {e}")
+                return 0, 0
+            try:
+                return self._clean_dir(path, cutoff_ts, dir_fd)
+            finally:
+                os.close(dir_fd)
+
+        cleaned_count = 0
+        cleaned_size = 0
+
+        try:
+            with os.scandir(path if dir_fd is None else dir_fd) as it:
+                entries = list(it)
+        except OSError as e:
+            logger.warning(f"无法读取目录 {path}: {e}")
+            return 0, 0
+
+        for entry in entries:
+            entry_path = os.path.join(path, entry.name)
+            # 有目录 fd 时按名称操作，否则使用完整路径
+            target = entry_path if dir_fd is None else entry.name
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    if dir_fd is None:
+                        count, size = self._clean_dir(entry_path, cutoff_ts)
+                    else:
+                        sub_fd = os.open(entry.name, _DIR_OPEN_FLAGS, dir_fd=dir_fd)
+                        try:
+                            count, size = self._clean_dir(entry_path, cutoff_ts, sub_fd)
+                        finally:
+                            os.close(sub_fd)
+                    cleaned_count += count
+                    cleaned_size += size
+
+                    # 删除空目录（目录非空时 rmdir 会失败）
                     try:
-                        if not os.listdir(dir_full_path):
-                            os.rmdir(dir_full_path)
-                            logger.debug(f"删除空目录: {dir_full_path}")
+                        os.rmdir(target, dir_fd=dir_fd)
+                        logger.debug(f"删除空目录: {entry_path}")
                     except OSError:
                         pass
-
-        if cleaned_count > 0:
-            logger.info(f"用户 {user_id}: 清理 {cleaned_count} 个文件，释放 {self._format_size(cleaned_size)}")
+                    continue
+
+                # 一次 stat 同时获取修改时间和大小
+                stat = entry.stat(follow_symlinks=False)
+                if stat.st_mtime < cutoff_ts:
+                    os.remove(target, dir_fd=dir_fd)
+                    cleaned_count += 1
+                    cleaned_size += stat.st_size
+                    logger.debug(f"删除过期文件: {entry_path}")
+            except OSError as e:
+                logger.debug(f"删除文件失败 {entry_path}: {e}")
 
         return cleaned_count, cleaned_size
 
@@ -175,51 +262,63 @@ class FileCleaner:
 
         if force:
             # 强制清理：删除 temp 和 outputs 目录中的所有文件
-            cleaned_count = 0
-            cleaned_size = 0
-
-            for dir_name in ["temp", "outputs"]:
-                dir_path = os.path.join(workspace, dir_name)
-                if os.path.exists(dir_path):
-                    for filename in os.listdir(dir_path):
-                        file_path = os.path.join(dir_path, filename)
-                        try:
-                            if os.path.isfile(file_path):
-                                file_size = os.path.getsize(file_path)
-                                os.remove(file_path)
-                                cleaned_count += 1
-                                cleaned_size += file_size
-                            elif os.path.isdir(file_path):
-                                dir_size = self._get_dir_size(file_path)
-                                shutil.rmtree(file_path)
-                                cleaned_count += 1
-                                cleaned_size += dir_size
-                        except OSError as e:
-                            logger.warning(f"删除失败 {file_path}: {e}")
-
+            cleaned_count, cleaned_size = await asyncio.to_thread(self._force_clean_sync, workspace)
             return f"强制清理完成: 删除 {cleaned_count} 个项目，释放 {self._format_size(cleaned_size)}"
         else:
             cleaned, size = await self._clean_workspace(workspace, user_id)
             return f"清理完成: 删除 {cleaned} 个过期文件，释放 {self._format_size(size)}"
 
+    def _force_clean_sync(self, workspace: str) -> tuple:
+        """
+        删除 temp 和 outputs 目录中的所有文件（同步实现）
+
+        Args:
+            workspace: 工作区路径
+
+        Returns:
+            (删除项目数, 释放空间大小)
+        """
+        cleaned_count = 0
+        cleaned_size = 0
+
+        for dir_name in ["temp", "outputs"]:
+            dir_path = os.path.join(workspace, dir_name)
+            if os.path.exists(dir_path):
+                for filename in os.listdir(dir_path):
+                    file_path = os.path.join(dir_path, filename)
+                    try:
+                        if os.path.isfile(file_path):
+                            file_size = os.path.getsize(file_path)
+                            os.remove(file_path)
+                            cleaned_count += 1
+                            cleaned_size += file_size
+                        elif os.path.isdir(file_path):
+                            dir_size = self._get_dir_size(file_path)
+                            shutil.rmtree(file_path)
+                            cleaned_count += 1
+                            cleaned_size += dir_size
+                    except OSError as e:
+                        logger.warning(f"删除失败 {file_path}: {e}")
+
+        return cleaned_count, cleaned_size
+
     def _get_dir_size(self, path: str) -> int:
         """获取目录大小"""
         total = 0
-        for root, dirs, files in os.walk(path):
-            for filename in files:
-                try:
-                    total += os.path.getsize(os.path.join(root, filename))
-                except OSError:
-                    pass
+        try:
+            with os.scandir(path) as it:
+                for entry in it:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            total += self._get_dir_size(entry.path)
+                        else:
+                            total += entry.stat(follow_symlinks=False).st_size
+                    except OSError:
+                        pass
+        except OSError:
+            pass
         return total
 
     def _format_size(self, size_bytes: int) -> str:
         """格式化文件大小"""
-        if size_bytes < 1024:
-            return f"{size_bytes} B"
-        elif size_bytes < 1024 * 1024:
-            return f"{size_bytes / 1024:.1f} KB"
-        elif size_bytes < 1024 * 1024 * 1024:
-            return f"{size_bytes / 1024 / 1024:.2f} MB"
-        else:
-            return f"{size_bytes / 1024 / 1024 / 1024:.2f} GB"
+        return self.plugin.quota_manager.format_size(size_bytes)
@@ -7,6 +7,9 @@ import os
 
 logger = logging.getLogger(__name__)
 
+# 大小单位及显示精度，下标 i 对应 1024 ** i 字节
+SIZE_UNITS = (("B", ""), ("KB", ".1f"), ("MB", ".2f"), ("GB", ".2f"))
+
 
 class QuotaManager:
     """用户存储配额管理器"""
@@ -118,9 +121,7 @@ class QuotaManager:
         """格式化文件大小"""
         if size_bytes < 1024:
             return f"{size_bytes} B"
-        elif size_bytes < 1024 * 1024:
-            return f"{size_bytes / 1024:.1f} KB"
-        elif size_bytes < 1024 * 1024 * 1024:
-            return f"{size_bytes / 1024 / 1024:.2f} MB"
-        else:
-            return f"{size_bytes / 1024 / 1024 / 1024:.2f} GB"
+        # 按二进制位数直接确定单位：每 10 位对应一级
+        index = min((int(size_bytes).bit_length() - 1) // 10, len(SIZE_UNITS) - 1)
+        unit, spec = SIZE_UNITS[index]
+        return f"{size_bytes / (1 << (10 * index)):{spec}} {unit}"
@@ -2,7 +2,7 @@
 工具模块 - 新增的 LLM 工具
 """
 from .fact_check_tools import FactCheckTools, SearchResult, VerificationResult
-from .fact_extractor import FactExtractor, FactPoint
+from .fact_extractor import FactExtractor, FactPoint, PlanItem, VerificationPlan
 from .markdown_renderer import MarkdownRenderer
 from .news_analyzer import AnalysisResult, NewsAnalyzer
 from .report_generator import ReportGenerator
@@ -16,6 +16,8 @@ __all__ = [
     # 事实提取
     "FactExtractor",
     "FactPoint",
+    "PlanItem",
+    "VerificationPlan",
     # 新闻分析
     "NewsAnalyzer",
     "AnalysisResult",
@@ -11,7 +11,7 @@ if TYPE_CHECKING:
 from astrbot.api import logger
 
 from ..credibility import CredibilityEvaluator, SourceRegistry
-from .fact_extractor import FactExtractor, FactPoint
+from .fact_extractor import FactExtractor, FactPoint, VerificationPlan
 from .news_analyzer import AnalysisResult, NewsAnalyzer
 from .report_generator import ReportGenerator
 
@@ -58,6 +58,10 @@ class FactCheckTools:
         # 配置
         self.max_search_results = plugin.config.get("max_search_results", 10)
 
+    async def close(self):
+        """释放评估器持有的网络资源"""
+        await self.evaluator.close()
+
     def extract_facts(self, text: str, min_verifiability: str = "medium") -> list[FactPoint]:
         """
         从文本中提取可验证的事实点
@@ -147,26 +151,29 @@ class FactCheckTools:
         Returns:
             评估后的搜索结果列表
         """
-        evaluated = []
-
+        valid_results = []
         for result in results[:self.max_search_results]:
             # 处理可能的字符串类型（LLM 可能传入格式不一致的数据）
             if isinstance(result, str):
                 logger.warning(f"跳过非字典类型的搜索结果: {result[:50]}...")
                 continue
-            if not isinstance(result, dict):
-                continue
+            if isinstance(result, dict):
+                valid_results.append(result)
 
-            url = result.get("url", "")
+        # 并发动态评估所有来源
+        urls = [result.get("url", "") for result in valid_results]
+        evaluations = await self.evaluator.evaluate_sources_batch(urls)
+
+        evaluated = []
+        for result, url, evaluation in zip(valid_results, urls, evaluations):
             title = result.get("title", "")
             snippet = result.get("snippet", result.get("description", ""))
 
-            try:
-                # 动态评估来源可信度
-                score, source_info, dynamic_result = await self.evaluator.evaluate_source_with_dynamic(url)
-            except Exception as e:
-                logger.warning(f"动态评估失败 {url}: {e}")
+            if isinstance(evaluation, Exception):
+                logger.warning(f"动态评估失败 {url}: {evaluation}")
                 score, source_info = self.evaluator.evaluate_source(url)
+            else:
+                score, source_info, _ = evaluation
 
             supports = self._check_support(title, snippet, claim) if claim else False
 
@@ -433,7 +440,7 @@ class FactCheckTools:
 
         return "\n".join(lines)
 
-    def get_verification_plan(self, news_text: str) -> dict:
+    def get_verification_plan(self, news_text: str) -> VerificationPlan:
         """
         获取验证计划（用于展示给用户）
 
@@ -441,7 +448,7 @@ class FactCheckTools:
             news_text: 新闻文本
 
         Returns:
-            验证计划字典
+            验证计划
         """
         facts = self.extract_facts(news_text)
         return self.fact_extractor.generate_verification_plan(facts)
@@ -3,12 +3,41 @@
 从新闻文本中提取可以被验证的事实声明
 """
 import re
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
     from ..main import WorkspacePlugin
 
+# 可验证性等级排序（数值越小越优先）及中文名称
+_VERIFIABILITY_ORDER = {"high": 0, "medium": 1, "low": 2}
+_VERIFIABILITY_CN = {"high": "高", "medium": "中", "low": "低"}
+
+# 事实类别的识别优先级
+_CATEGORY_PRIORITY = ("number", "time", "quote", "event", "place", "person")
+
+# 分句用的正则（中英文句号、问号、感叹号）
+_SENTENCE_END_RE = re.compile(r"[。！？.!?]")
+# 纯 ASCII 文本分句时，将句末标点统一替换为 \0 后直接 split
+_ASCII_SENTENCE_END_TABLE = str.maketrans(".!?", "\0\0\0")
+
+# 可验证性评估用的正则
+_QUOTE_RE = re.compile("表示|称|说|指出")
+_DIGIT_RE = re.compile(r"\d+")
+_DATE_MENTION_RE = re.compile(r"\d{4}年|\d{1,2}月|\d{1,2}日")
+_PLACE_RE = re.compile(r"[省市区县]|北京|上海|广州|深圳")
+
+# 搜索查询生成用的正则
+_NUMBER_RE = re.compile(r"\d+[万亿%％元美元人次例起件吨公里]*")
+_DATE_RE = re.compile(r"\d{4}年\d{1,2}月\d{1,2}日|\d{1,2}月\d{1,2}日|\d{4}年")
+_NAME_RE = re.compile(r"[A-Z][a-z]+|[\u4e00-\u9fa5]{2,4}(?:省|市|区|县|公司|集团|大学|医院)")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def _compile_keywords(words) -> re.Pattern:
+    """将关键词列表编译为一个分支正则，一次扫描即可判断是否包含任一关键词"""
+    return re.compile("|".join(map(re.escape, words)))
+
 
 @dataclass
 class FactPoint:
@@ -20,6 +49,24 @@ class FactPoint:
     context: str = ""       # 上下文信息
 
 
+@dataclass(slots=True)
+class PlanItem:
+    """验证计划中的事实点"""
+    statement: str          # 事实陈述
+    category: str           # 类别
+    search_query: str       # 建议的搜索查询
+
+
+@dataclass(slots=True)
+class VerificationPlan:
+    """验证计划"""
+    total_facts: int                                                # 事实点总数
+    high_priority: list[PlanItem] = field(default_factory=list)     # 高可验证性事实点
+    medium_priority: list[PlanItem] = field(default_factory=list)   # 中可验证性事实点
+    low_priority: list[PlanItem] = field(default_factory=list)      # 低可验证性事实点
+    search_queries: list[str] = field(default_factory=list)         # 所有搜索查询
+
+
 class FactExtractor:
     """可验证事实点提取器"""
 
@@ -50,6 +97,18 @@ class FactExtractor:
             "这", "那", "个", "些", "着", "过", "到", "从", "向", "把", "给",
         ]
 
+        # 停用词替换为空格：单字停用词用 translate 一次完成，多字停用词用正则
+        self._stop_table = str.maketrans({w: " " for w in self.stop_words if len(w) == 1})
+        multi_char_stop_words = [w for w in self.stop_words if len(w) > 1]
+        self._stop_re = _compile_keywords(multi_char_stop_words) if multi_char_stop_words else None
+
+        # 预编译关键词匹配：主观词汇一个正则，事实类别按优先级各一个正则
+        self._subjective_re = _compile_keywords(self.subjective_words)
+        self._category_res = [
+            (category, _compile_keywords(self.category_patterns[category]))
+            for category in _CATEGORY_PRIORITY
+        ]
+
     def extract_facts(self, text: str) -> list[FactPoint]:
         """
         从文本中提取可验证的事实点
@@ -62,80 +121,75 @@ class FactExtractor:
         """
         facts = []
 
-        # 按句子分割
-        sentences = self._split_sentences(text)
+        # 按句子分割，跳过太短的句子和包含主观词汇的句子
+        is_subjective = self._is_subjective
+        sentences = [
+            sentence for sentence in self._split_sentences(text)
+            if len(sentence) >= 10 and not is_subjective(sentence)
+        ]
 
         for sentence in sentences:
-            # 跳过太短的句子
-            if len(sentence) < 10:
-                continue
-
-            # 检查是否包含主观词汇
-            if self._is_subjective(sentence):
-                continue
-
             # 识别事实类别
             category = self._identify_category(sentence)
             if not category:
                 continue
 
+            # 数字检查结果在可验证性评估和搜索查询生成中共用
+            has_digits = _DIGIT_RE.search(sentence) is not None
+
             # 评估可验证性
-            verifiability = self._assess_verifiability(sentence, category)
+            verifiability = self._assess_verifiability(sentence, category, has_digits)
 
             # 生成搜索查询
-            search_query = self._generate_search_query(sentence, category)
+            search_query = self._generate_search_query(sentence, category, has_digits)
 
             facts.append(FactPoint(
-                statement=sentence.strip(),
+                statement=sentence,
                 category=category,
                 verifiability=verifiability,
                 search_query=search_query
             ))
 
         # 按可验证性排序，优先返回高可验证性的事实
-        facts.sort(key=lambda x: {"high": 0, "medium": 1, "low": 2}.get(x.verifiability, 3))
+        facts.sort(key=lambda x: _VERIFIABILITY_ORDER.get(x.verifiability, 3))
 
         return facts
 
     def _split_sentences(self, text: str) -> list[str]:
         """分割句子"""
-        # 按中英文句号、问号、感叹号分割
-        sentences = re.split(r"[。！？.!?]", text)
-        return [s.strip() for s in sentences if s.strip()]
+        # 按中英文句号、问号、感叹号分割（纯 ASCII 文本走 translate + split）
+        if text.isascii() and "\0" not in text:
+            sentences = text.translate(_ASCII_SENTENCE_END_TABLE).split("\0")
+        else:
+            sentences = _SENTENCE_END_RE.split(text)
+        return [s for s in map(str.strip, sentences) if s]
 
     def _is_subjective(self, sentence: str) -> bool:
         """检查句子是否为主观表达"""
-        for word in self.subjective_words:
-            if word in sentence:
-                return True
-        return False
+        return self._subjective_re.search(sentence) is not None
 
     def _identify_category(self, sentence: str) -> str:
         """识别事实类别"""
         # 按优先级检查类别
-        priority_order = ["number", "time", "quote", "event", "place", "person"]
-
-        for category in priority_order:
-            patterns = self.category_patterns.get(category, [])
-            for pattern in patterns:
-                if pattern in sentence:
-                    return category
+        for category, category_re in self._category_res:
+            if category_re.search(sentence):
+                return category
         return ""
 
-    def _assess_verifiability(self, sentence: str, category: str) -> str:
+    def _assess_verifiability(self, sentence: str, category: str, has_digits: bool) -> str:
         """评估可验证性"""
         score = 0
 
         # 包含具体数字
-        if re.search(r"\d+", sentence):
+        if has_digits:
             score += 1
 
-        # 包含具体日期
-        if re.search(r"\d{4}年|\d{1,2}月|\d{1,2}日", sentence):
-            score += 1
+            # 包含具体日期（日期一定包含数字，没有数字时无需检查）
+            if _DATE_MENTION_RE.search(sentence):
+                score += 1
 
         # 包含引用（某人说）
-        if any(word in sentence for word in ["表示", "称", "说", "指出"]):
+        if _QUOTE_RE.search(sentence):
             score += 1
 
         # 类别加分
@@ -143,7 +197,7 @@ class FactExtractor:
             score += 1
 
         # 包含具体地点
-        if re.search(r"[省市区县]|北京|上海|广州|深圳", sentence):
+        if _PLACE_RE.search(sentence):
             score += 1
 
         if score >= 3:
@@ -153,19 +207,22 @@ class FactExtractor:
         else:
             return "low"
 
-    def _generate_search_query(self, sentence: str, category: str) -> str:
+    def _generate_search_query(self, sentence: str, category: str, has_digits: bool) -> str:
         """生成搜索查询"""
         # 移除停用词
-        query = sentence
-        for word in self.stop_words:
-            query = query.replace(word, " ")
-
-        # 提取数字和日期
-        numbers = re.findall(r"\d+[万亿%％元美元人次例起件吨公里]*", sentence)
-        dates = re.findall(r"\d{4}年\d{1,2}月\d{1,2}日|\d{1,2}月\d{1,2}日|\d{4}年", sentence)
+        query = sentence.translate(self._stop_table)
+        if self._stop_re is not None:
+            query = self._stop_re.sub(" ", query)
+
+        # 提取数字和日期（没有数字时跳过）
+        if has_digits:
+            numbers = _NUMBER_RE.findall(sentence)
+            dates = _DATE_RE.findall(sentence)
+        else:
+            numbers = dates = []
 
         # 提取可能的专有名词（连续的中文字符）
-        names = re.findall(r"[A-Z][a-z]+|[\u4e00-\u9fa5]{2,4}(?:省|市|区|县|公司|集团|大学|医院)", sentence)
+        names = _NAME_RE.findall(sentence)
 
         # 构建查询
         key_parts = []
@@ -177,7 +234,7 @@ class FactExtractor:
             key_parts.extend(names[:2])
 
         # 保留句子的核心部分
-        query = re.sub(r"\s+", " ", query).strip()
+        query = _WHITESPACE_RE.sub(" ", query).strip()
         if len(query) > 30:
             query = query[:30]
 
@@ -201,12 +258,11 @@ class FactExtractor:
         Returns:
             过滤后的事实点列表
         """
-        levels = {"high": 0, "medium": 1, "low": 2}
-        min_level = levels.get(min_verifiability, 1)
+        min_level = _VERIFIABILITY_ORDER.get(min_verifiability, 1)
 
-        return [f for f in facts if levels.get(f.verifiability, 2) <= min_level]
+        return [f for f in facts if _VERIFIABILITY_ORDER.get(f.verifiability, 2) <= min_level]
 
-    def generate_verification_plan(self, facts: list[FactPoint]) -> dict:
+    def generate_verification_plan(self, facts: list[FactPoint]) -> VerificationPlan:
         """
         生成验证计划
 
@@ -214,31 +270,19 @@ class FactExtractor:
             facts: 事实点列表
 
         Returns:
-            验证计划字典
+            验证计划
         """
-        plan = {
-            "total_facts": len(facts),
-            "high_priority": [],
-            "medium_priority": [],
-            "low_priority": [],
-            "search_queries": []
-        }
+        plan = VerificationPlan(
+            total_facts=len(facts),
+            search_queries=[fact.search_query for fact in facts]
+        )
+        # 可验证性 -> 对应优先级列表，其余归入低优先级
+        buckets = {"high": plan.high_priority, "medium": plan.medium_priority}
 
         for fact in facts:
-            item = {
-                "statement": fact.statement,
-                "category": fact.category,
-                "search_query": fact.search_query
-            }
-
-            if fact.verifiability == "high":
-                plan["high_priority"].append(item)
-            elif fact.verifiability == "medium":
-                plan["medium_priority"].append(item)
-            else:
-                plan["low_priority"].append(item)
-
-            plan["search_queries"].append(fact.search_query)
+            buckets.get(fact.verifiability, plan.low_priority).append(
+                PlanItem(fact.statement, fact.category, fact.search_query)
+            )
 
         return plan
 
@@ -256,13 +300,12 @@ class FactExtractor:
             return "未能从文本中提取到可验证的事实点。"
 
         lines = [f"共提取到 {len(facts)} 个可验证事实点：", ""]
+        high_count = 0
 
         for i, fact in enumerate(facts, 1):
-            verifiability_cn = {
-                "high": "高",
-                "medium": "中",
-                "low": "低"
-            }.get(fact.verifiability, "未知")
+            if fact.verifiability == "high":
+                high_count += 1
+            verifiability_cn = _VERIFIABILITY_CN.get(fact.verifiability, "未知")
 
             statement_display = fact.statement[:50] + "..." if len(fact.statement) > 50 else fact.statement
 
@@ -271,8 +314,7 @@ class FactExtractor:
             lines.append(f"   建议搜索: {fact.search_query}")
             lines.append("")
 
-        # 添加验证建议
-        plan = self.generate_verification_plan(facts)
-        lines.append(f"验证建议: 优先验证 {len(plan['high_priority'])} 个高可验证性事实点")
+        # 添加验证建议（高可验证性数量已在上面的循环中统计，无需再生成验证计划）
+        lines.append(f"验证建议: 优先验证 {high_count} 个高可验证性事实点")
 
         return "\n".join(lines)
@@ -14,16 +14,131 @@ if TYPE_CHECKING:
 import aiohttp
 from astrbot.api import logger
 
+# 轮询 urlscan.io 扫描结果的等待间隔（秒），扫描完成即停止等待
+URLSCAN_POLL_DELAYS = (2, 3, 5, 8, 13)
+# 被 urlscan.io 限流（429）时按 Retry-After 等待的最长时间（秒）
+URLSCAN_MAX_RETRY_AFTER = 30
+
+# urlscan.io 请求的连接池设置（只访问 urlscan.io，保持少量长连接并缓存 DNS 解析结果）
+URLSCAN_CONNECTION_LIMIT = 4
+URLSCAN_DNS_CACHE_TTL = 600
+URLSCAN_KEEPALIVE_TIMEOUT = 60
+
+# 下载截图时每次写入磁盘的块大小
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+# 截图时默认拦截的资源类型（只截取首屏，不需要媒体、字体和长连接）
+DEFAULT_BLOCKED_RESOURCE_TYPES = ("media", "font", "websocket")
+
+# 截图文件扩展名（小写）
+SCREENSHOT_EXTENSIONS = frozenset({".png", ".jpg", ".jpeg"})
+
+
+class _BrowserPool:
+    """
+    Chromium 浏览器池
+
+    浏览器按需启动，最多同时借出 size 个（每个借出的浏览器同时只有一个上下文，
+    因此同时打开的浏览器上下文也不超过 size 个）；
+    每个浏览器使用 max_uses 次后关闭，下次借用时重新启动，避免长期运行占用内存过多
+    """
+
+    def __init__(self, launcher, size: int, max_uses: int):
+        """
+        Args:
+            launcher: 启动浏览器的协程函数
+            size: 浏览器数量上限
+            max_uses: 每个浏览器的最大使用次数
+        """
+        self._launcher = launcher
+        self._max_uses = max_uses
+        self._semaphore = asyncio.BoundedSemaphore(size)
+        self._idle = []
+        self._uses: dict[int, int] = {}
+
+    async def acquire(self):
+        """借出一个可用的浏览器（没有空闲浏览器时启动新的）"""
+        await self._semaphore.acquire()
+        try:
+            while self._idle:
+                browser = self._idle.pop()
+                if browser.is_connected():
+                    return browser
+                self._uses.pop(id(browser), None)
+
+            browser = await self._launcher()
+            self._uses[id(browser)] = 0
+            return browser
+        except BaseException:
+            self._semaphore.release()
+            raise
+
+    async def release(self, browser):
+        """归还浏览器，达到使用次数上限或已断开时关闭"""
+        try:
+            uses = self._uses.get(id(browser), 0) + 1
+            if uses >= self._max_uses or not browser.is_connected():
+                self._uses.pop(id(browser), None)
+                await self._close_browser(browser)
+            else:
+                self._uses[id(browser)] = uses
+                self._idle.append(browser)
+        finally:
+            self._semaphore.release()
+
+    async def close(self):
+        """关闭所有空闲浏览器"""
+        idle, self._idle = self._idle, []
+        for browser in idle:
+            self._uses.pop(id(browser), None)
+            await self._close_browser(browser)
+
+    @staticmethod
+    async def _close_browser(browser):
+        try:
+            await browser.close()
+        except Exception as e:
+            logger.debug(f"关闭浏览器失败: {e}")
+
 
 class ScreenshotTool:
     """网页截图工具"""
 
+    # Chromium 启动参数（关闭截图用不到的功能，减少辅助进程和内存占用）
+    CHROMIUM_LAUNCH_ARGS = (
+        "--no-sandbox",
+        "--disable-setuid-sandbox",
+        "--disable-dev-shm-usage",
+        "--disable-gpu",
+        "--disable-accelerated-2d-canvas",
+        "--no-first-run",
+        "--disable-extensions",
+        "--disable-background-networking",
+        "--disable-breakpad",
+        "--mute-audio",
+        "--hide-scrollbars",
+        "--disable-features=Translate,BackForwardCache",
+    )
+
     def __init__(self, plugin: "WorkspacePlugin"):
         self.plugin = plugin
         self.config = plugin.config.get("screenshot_config", {})
         self.timeout = plugin.config.get("screenshot_timeout", 30)
         self.use_mobile = self.config.get("use_mobile", False)
         self.urlscan_api_key = plugin.config.get("urlscan_api_key", "")
+        # 未配置 API Key 时不使用 urlscan.io 备用方案
+        self._urlscan_enabled = bool(self.urlscan_api_key)
+
+        # 截图时拦截的资源类型（可通过 blocked_resource_types 配置，为空则不拦截）
+        self.blocked_resource_types = frozenset(
+            self.config.get("blocked_resource_types", DEFAULT_BLOCKED_RESOURCE_TYPES)
+        )
+
+        # Chromium 启动参数（可通过 chromium_extra_args 追加）
+        self.launch_args = [
+            *self.CHROMIUM_LAUNCH_ARGS,
+            *self.config.get("chromium_extra_args", []),
+        ]
 
         # User-Agent
         self.pc_user_agent = (
@@ -43,11 +158,78 @@ class ScreenshotTool:
         window.chrome = {runtime: {}};
         """
 
+        # Playwright 只在创建工具时导入一次，未安装时截图直接返回安装提示
+        try:
+            from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+            from playwright.async_api import async_playwright
+        except ImportError:
+            async_playwright = PlaywrightTimeoutError = None
+        self._async_playwright = async_playwright
+        self._playwright_timeout_error = PlaywrightTimeoutError
+
+        # 常驻浏览器池：浏览器按需启动并复用，每次截图只新建上下文，close() 时关闭
+        self._playwright = None
+        self._playwright_lock = asyncio.Lock()
+        self._browser_pool = _BrowserPool(
+            self._launch_browser,
+            size=self.config.get("browser_pool_size", 2),
+            max_uses=self.config.get("browser_max_uses", 50),
+        )
+
+        # urlscan.io 请求复用的 HTTP 会话
+        self._session: aiohttp.ClientSession | None = None
+
+        # 批量截图的并发上限（含 urlscan.io 备用方案）
+        self._batch_semaphore = asyncio.Semaphore(
+            self.config.get("max_concurrent_screenshots", 3)
+        )
+
+        # 批量截图时是否共用一个浏览器上下文（省去逐个创建上下文的开销，但页面间共享 Cookie 和缓存）
+        self.share_batch_context = self.config.get("share_batch_context", False)
+
+    async def _launch_browser(self):
+        """启动一个 Chromium 浏览器（首次调用时启动 Playwright）"""
+        async with self._playwright_lock:
+            if self._playwright is None:
+                self._playwright = await self._async_playwright().start()
+
+        return await self._playwright.chromium.launch(
+            headless=True,
+            args=self.launch_args
+        )
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """获取复用的 HTTP 会话（首次调用或已关闭时创建）"""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=URLSCAN_CONNECTION_LIMIT,
+                ttl_dns_cache=URLSCAN_DNS_CACHE_TTL,
+                keepalive_timeout=URLSCAN_KEEPALIVE_TIMEOUT,
+            )
+            self._session = aiohttp.ClientSession(connector=connector)
+        return self._session
+
+    async def close(self):
+        """关闭浏览器池、Playwright 和 HTTP 会话"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+        await self._browser_pool.close()
+        async with self._playwright_lock:
+            if self._playwright is not None:
+                try:
+                    await self._playwright.stop()
+                except Exception as e:
+                    logger.debug(f"停止 Playwright 失败: {e}")
+                self._playwright = None
+
     async def screenshot_page(
         self,
         url: str,
         workspace: str,
-        use_mobile: bool = None
+        use_mobile: bool = None,
+        context=None
     ) -> tuple[str | None, str | None]:
         """
         对网页进行截图
@@ -56,6 +238,7 @@ class ScreenshotTool:
             url: 网页 URL
             workspace: 工作区路径
             use_mobile: 是否使用移动端视图
+            context: 已有的浏览器上下文（为 None 时单独创建）
 
         Returns:
             (screenshot_path, error_message)
@@ -63,8 +246,8 @@ class ScreenshotTool:
         use_mobile = use_mobile if use_mobile is not None else self.use_mobile
 
         # 优先使用 Playwright
-        result = await self._screenshot_with_playwright(url, workspace, use_mobile)
-        if result[0]:
+        result = await self._screenshot_with_playwright(url, workspace, use_mobile, context)
+        if result[0] or not self._urlscan_enabled:
             return result
 
         # Playwright 失败，尝试 urlscan.io 备用方案
@@ -75,81 +258,119 @@ class ScreenshotTool:
         self,
         url: str,
         workspace: str,
-        use_mobile: bool = False
+        use_mobile: bool = False,
+        context=None
     ) -> tuple[str | None, str | None]:
-        """使用 Playwright 截图"""
-        try:
-            from playwright.async_api import async_playwright
-        except ImportError:
+        """使用 Playwright 截图（传入 context 时在其中新开页面，否则借用浏览器并新建上下文）"""
+        if self._async_playwright is None:
             return None, (
                 "Playwright 未安装，请运行: "
                 "pip install playwright && playwright install chromium"
             )
 
-        screenshot_path = None
+        if context is not None:
+            try:
+                return await self._capture_page(context, url, workspace)
+            except Exception as e:
+                logger.error(f"Playwright 截图失败: {e}")
+                return None, str(e)
+
         try:
-            async with async_playwright() as p:
-                # 启动浏览器
-                browser = await p.chromium.launch(
-                    headless=True,
-                    args=[
-                        "--no-sandbox",
-                        "--disable-setuid-sandbox",
-                        "--disable-dev-shm-usage",
-                        "--disable-gpu",
-                    ]
-                )
+            # 从浏览器池借用浏览器
+            browser = await self._browser_pool.acquire()
+        except Exception as e:
+            logger.error(f"Playwright 截图失败: {e}")
+            return None, str(e)
 
-                # 创建上下文
-                user_agent = (
-                    self.mobile_user_agent if use_mobile else self.pc_user_agent
-                )
-                viewport = (
-                    {"width": 375, "height": 812}
-                    if use_mobile
-                    else {"width": 1280, "height": 800}
-                )
-                context_options = {
-                    "user_agent": user_agent,
-                    "viewport": viewport,
-                    "locale": "zh-CN",
-                }
+        try:
+            context = await self._new_context(browser, use_mobile)
+            try:
+                return await self._capture_page(context, url, workspace)
+            finally:
+                await context.close()
 
-                context = await browser.new_context(**context_options)
-                page = await context.new_page()
+        except Exception as e:
+            logger.error(f"Playwright 截图失败: {e}")
+            return None, str(e)
+        finally:
+            await self._browser_pool.release(browser)
 
-                # 注入 stealth 脚本
-                await page.add_init_script(self.stealth_script)
+    async def _new_context(self, browser, use_mobile: bool):
+        """创建浏览器上下文（注入 stealth 脚本并拦截无用资源）"""
+        user_agent = (
+            self.mobile_user_agent if use_mobile else self.pc_user_agent
+        )
+        viewport = (
+            {"width": 375, "height": 812}
+            if use_mobile
+            else {"width": 1280, "height": 800}
+        )
+        context_options = {
+            "user_agent": user_agent,
+            "viewport": viewport,
+            "locale": "zh-CN",
+        }
 
-                # 访问页面
-                await page.goto(
-                    url, wait_until="networkidle", timeout=self.timeout * 1000
-                )
+        context = await browser.new_context(**context_options)
+        try:
+            # 注入 stealth 脚本
+            await context.add_init_script(self.stealth_script)
+
+            # 拦截截图用不到的资源，减少下载量和等待时间
+            if self.blocked_resource_types:
+                await context.route("**/*", self._route_request)
+        except BaseException:
+            await context.close()
+            raise
+        return context
+
+    async def _capture_page(
+        self,
+        context,
+        url: str,
+        workspace: str
+    ) -> tuple[str | None, str | None]:
+        """在上下文中新开页面并截图，完成后关闭页面"""
+        page = await context.new_page()
+        try:
+            # 访问页面（DOM 加载完即可，不等待统计脚本等长连接）
+            await page.goto(
+                url, wait_until="domcontentloaded", timeout=self.timeout * 1000
+            )
 
-                # 等待页面稳定
-                await asyncio.sleep(1)
+            # 短暂等待网络空闲，超时则直接截图
+            try:
+                await page.wait_for_load_state("networkidle", timeout=3000)
+            except self._playwright_timeout_error:
+                pass
 
-                # 生成截图路径
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                output_dir = os.path.join(workspace, "outputs", "screenshots")
-                os.makedirs(output_dir, exist_ok=True)
+            # 等待页面稳定
+            await asyncio.sleep(0.25)
 
-                # 从 URL 提取域名作为文件名
-                domain = urlparse(url).netloc.replace(".", "_")
-                filename = f"screenshot_{domain}_{timestamp}.png"
-                screenshot_path = os.path.join(output_dir, filename)
+            # 生成截图路径
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            output_dir = os.path.join(workspace, "outputs", "screenshots")
+            await asyncio.to_thread(os.makedirs, output_dir, exist_ok=True)
 
-                # 截图
-                await page.screenshot(path=screenshot_path, full_page=False)
+            # 从 URL 提取域名作为文件名
+            domain = urlparse(url).netloc.replace(".", "_")
+            filename = f"screenshot_{domain}_{timestamp}.png"
+            screenshot_path = os.path.join(output_dir, filename)
 
-                await browser.close()
+            # 截图
+            await page.screenshot(path=screenshot_path, full_page=False)
 
-                logger.info(f"Playwright 截图成功: {screenshot_path}")
-                return screenshot_path, None
+            logger.info(f"Playwright 截图成功: {screenshot_path}")
+            return screenshot_path, None
+        finally:
+            await page.close()
 
-        except Exception as e:
-            logger.error(f"Playwright 截图失败: {e}")
-            return None, str(e)
+    async def _route_request(self, route):
+        """拦截指定类型的资源请求，其余请求正常放行"""
+        if route.request.resource_type in self.blocked_resource_types:
+            await route.abort()
+        else:
+            await route.continue_()
 
     async def _screenshot_with_urlscan(
         self,
@@ -161,55 +382,73 @@ class ScreenshotTool:
             return None, "urlscan.io API Key 未配置"
 
         try:
-            async with aiohttp.ClientSession() as session:
-                # 提交扫描请求
-                headers = {
-                    "API-Key": self.urlscan_api_key,
-                    "Content-Type": "application/json",
-                }
-                data = {"url": url, "visibility": "unlisted"}
-
-                async with session.post(
-                    "https://urlscan.io/api/v1/scan/",
-                    headers=headers,
-                    json=data,
-                    timeout=aiohttp.ClientTimeout(total=30)
-                ) as resp:
-                    if resp.status != 200:
-                        error_text = await resp.text()
-                        return None, (
-                            f"urlscan.io 提交失败: {resp.status} - "
-                            f"{error_text[:100]}"
-                        )
-                    result = await resp.json()
-                    scan_uuid = result.get("uuid")
-
-                if not scan_uuid:
-                    return None, "urlscan.io 未返回扫描 UUID"
-
-                # 等待扫描完成
-                logger.info(f"等待 urlscan.io 扫描完成: {scan_uuid}")
-                await asyncio.sleep(15)
-
-                # 获取截图
-                screenshot_url = f"https://urlscan.io/screenshots/{scan_uuid}.png"
-                timeout = aiohttp.ClientTimeout(total=30)
-                async with session.get(screenshot_url, timeout=timeout) as resp:
-                    if resp.status != 200:
-                        return None, f"获取截图失败: {resp.status}"
-
-                    # 保存截图
-                    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                    output_dir = os.path.join(workspace, "outputs", "screenshots")
-                    os.makedirs(output_dir, exist_ok=True)
-                    filename = f"urlscan_{scan_uuid}_{timestamp}.png"
-                    screenshot_path = os.path.join(output_dir, filename)
-
-                    with open(screenshot_path, "wb") as f:
-                        f.write(await resp.read())
-
-                    logger.info(f"urlscan.io 截图成功: {screenshot_path}")
-                    return screenshot_path, None
+            session = await self._get_session()
+
+            # 提交扫描请求
+            headers = {
+                "API-Key": self.urlscan_api_key,
+                "Content-Type": "application/json",
+            }
+            data = {"url": url, "visibility": "unlisted"}
+
+            async with session.post(
+                "https://urlscan.io/api/v1/scan/",
+                headers=headers,
+                json=data,
+                timeout=aiohttp.ClientTimeout(total=30)
+            ) as resp:
+                if resp.status != 200:
+                    error_text = await resp.text()
+                    return None, (
+                        f"urlscan.io 提交失败: {resp.status} - "
+                        f"{error_text[:100]}"
+                    )
+                result = await resp.json()
+                scan_uuid = result.get("uuid")
+
+            if not scan_uuid:
+                return None, "urlscan.io 未返回扫描 UUID"
+
+            # 等待扫描完成（轮询结果接口，扫描未完成时返回 404）
+            logger.info(f"等待 urlscan.io 扫描完成: {scan_uuid}")
+            result_url = f"https://urlscan.io/api/v1/result/{scan_uuid}/"
+            timeout = aiohttp.ClientTimeout(total=30)
+            retry_after = 0
+            for delay in URLSCAN_POLL_DELAYS:
+                await asyncio.sleep(max(delay, retry_after))
+                async with session.get(result_url, timeout=timeout) as resp:
+                    if resp.status == 200:
+                        break
+                    # 未完成（404）、限流（429）或服务端错误时继续等待，限流时按 Retry-After 延后
+                    retry_after = 0
+                    if resp.status == 429:
+                        value = resp.headers.get("Retry-After", "")
+                        if value.isdigit():
+                            retry_after = min(int(value), URLSCAN_MAX_RETRY_AFTER)
+
+            # 获取截图
+            screenshot_url = f"https://urlscan.io/screenshots/{scan_uuid}.png"
+            async with session.get(screenshot_url, timeout=timeout) as resp:
+                if resp.status != 200:
+                    return None, f"获取截图失败: {resp.status}"
+
+                # 保存截图
+                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+                output_dir = os.path.join(workspace, "outputs", "screenshots")
+                await asyncio.to_thread(os.makedirs, output_dir, exist_ok=True)
+                filename = f"urlscan_{scan_uuid}_{timestamp}.png"
+                screenshot_path = os.path.join(output_dir, filename)
+
+                # 分块写入磁盘，不把整张截图读入内存，文件操作不阻塞事件循环
+                f = await asyncio.to_thread(open, screenshot_path, "wb")
+                try:
+                    async for chunk in resp.content.iter_chunked(DOWNLOAD_CHUNK_SIZE):
+                        await asyncio.to_thread(f.write, chunk)
+                finally:
+                    await asyncio.to_thread(f.close)
+
+                logger.info(f"urlscan.io 截图成功: {screenshot_path}")
+                return screenshot_path, None
 
         except asyncio.TimeoutError:
             return None, "urlscan.io 请求超时"
@@ -234,9 +473,26 @@ class ScreenshotTool:
         Returns:
             截图结果列表 [{"url": url, "path": path, "error": error}, ...]
         """
+        async def screenshot_one(url: str, context=None) -> tuple[str | None, str | None]:
+            async with self._batch_semaphore:
+                return await self.screenshot_page(url, workspace, context=context)
+
+        # 并发截图（数量受信号量和浏览器池限制）
+        urls = urls[:max_screenshots]
+        if self.share_batch_context and self._async_playwright is not None and len(urls) > 1:
+            screenshots = await self._batch_in_shared_context(urls, screenshot_one)
+        else:
+            screenshots = await asyncio.gather(
+                *(screenshot_one(url) for url in urls),
+                return_exceptions=True
+            )
+
         results = []
-        for url in urls[:max_screenshots]:
-            path, error = await self.screenshot_page(url, workspace)
+        for url, screenshot in zip(urls, screenshots):
+            if isinstance(screenshot, BaseException):
+                path, error = None, str(screenshot)
+            else:
+                path, error = screenshot
             results.append({
                 "url": url,
                 "path": path,
@@ -244,6 +500,33 @@ class ScreenshotTool:
             })
         return results
 
+    async def _batch_in_shared_context(self, urls: list[str], screenshot_one) -> list:
+        """借用一个浏览器并创建一个上下文，批量截图的每个 URL 在其中新开页面"""
+        browser = context = None
+        try:
+            browser = await self._browser_pool.acquire()
+            context = await self._new_context(browser, self.use_mobile)
+        except Exception as e:
+            # 先归还浏览器，避免逐个截图时因浏览器池耗尽而互相等待
+            if browser is not None:
+                await self._browser_pool.release(browser)
+            logger.warning(f"共享上下文创建失败，改为逐个截图: {e}")
+            return await asyncio.gather(
+                *(screenshot_one(url) for url in urls),
+                return_exceptions=True
+            )
+
+        try:
+            try:
+                return await asyncio.gather(
+                    *(screenshot_one(url, context) for url in urls),
+                    return_exceptions=True
+                )
+            finally:
+                await context.close()
+        finally:
+            await self._browser_pool.release(browser)
+
     def get_screenshot_paths(self, workspace: str) -> list[str]:
         """
         获取工作区中所有截图文件路径
@@ -255,12 +538,22 @@ class ScreenshotTool:
             截图文件路径列表
         """
         screenshot_dir = os.path.join(workspace, "outputs", "screenshots")
-        if not os.path.exists(screenshot_dir):
+        try:
+            with os.scandir(screenshot_dir) as it:
+                entries = [
+                    entry for entry in it
+                    if os.path.splitext(entry.name)[1].lower() in SCREENSHOT_EXTENSIONS
+                ]
+        except OSError:
             return []
 
-        paths = []
-        for filename in os.listdir(screenshot_dir):
-            if filename.endswith((".png", ".jpg", ".jpeg")):
-                paths.append(os.path.join(screenshot_dir, filename))
+        # 按修改时间从新到旧排序，扫描后被删除的文件直接跳过
+        files = []
+        for entry in entries:
+            try:
+                files.append((entry.stat().st_mtime, entry.path))
+            except OSError:
+                continue
 
-        return sorted(paths, key=os.path.getmtime, reverse=True)
+        files.sort(reverse=True)
+        return [path for _, path in files]